@@ -1,12 +1,24 @@
 import traceback
 import threading, _thread, ctypes
-import time, json, os, fnmatch
+import time, json, os, sys, fnmatch, math, signal, tracemalloc, cProfile
 import argparse
+import multiprocessing, subprocess
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
 from typing import Any, Callable, Dict, List, Tuple, Union
 from queue import Queue
 
+try:
+    import resource
+except ImportError: # Not available on Windows, the sandbox falls back to running the tests in a thread
+    resource = None
+
 from helpers.globals import *
 from helpers.utils import *
+from helpers.fixtures import FixtureCache
+from helpers.results import ResultCache, snapshot_files, source_files
+from helpers.profiling import summarize_profile, print_hotspots, write_collapsed_stacks
+from helpers.report import REPORT_FORMATS, DEFAULT_REPORT_PATHS, ProblemRecord, TestRecord, make_test_record, write_report
 
 root = "testcases"
 
@@ -17,7 +29,9 @@ def get_test_cases(path: str, pattern: str) -> List[Dict[str, Any]]:
         if not fnmatch.fnmatchcase(filename, pattern): continue
         filepath = os.path.join(path, filename)
         if os.path.isfile(filepath) and os.path.splitext(filepath)[1] == ".json":
-            test_cases.append(json.load(open(filepath, 'r')))
+            test_case = json.load(open(filepath, 'r'))
+            test_case["__path__"] = filepath
+            test_cases.append(test_case)
     return test_cases
 
 def read_problems() -> Tuple[str, List[Dict[Any, str]]]:
@@ -28,16 +42,55 @@ def raise_exception_in_thread(thread: threading.Thread, exception: Exception):
     tid = thread.ident
     ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_long(tid), ctypes.py_object(exception))
 
-def run_test(fn: Callable, input_args: Arguments, cmp: Callable, cmp_args: Arguments, timeout: 10) -> Union[Result, None]:
+# The measurements of a test case (see helpers/report.py for the keys)
+Metrics = Dict[str, Any]
+
+# The peak resident memory of the current process in KB (macOS reports it in bytes)
+def peak_rss() -> int:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+def measure_call(fn: Callable, input_args: Arguments, cmp: Callable, cmp_args: Arguments, trace_memory: bool = False,
+                 profile: int = 0, profile_stacks: bool = False) -> Tuple[Union[Result, None], Metrics]:
+    '''
+        Calls the function then the comparator in the current thread and returns the result with:
+        the wall and CPU time of the thread, the call counts fetched by the test tools,
+        if trace_memory is True, the peak memory allocated according to tracemalloc and,
+        if profile is positive, the top "profile" hotspots (and the collapsed stacks if profile_stacks is True) of cProfile.
+    '''
+    clear_fetched_call_counts()
+    if trace_memory:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+    if profile:
+        profiler = cProfile.Profile()
+    wall_start, cpu_start = time.perf_counter(), time.thread_time()
+    try:
+        if profile: profiler.enable()
+        output = fn(*input_args.args, **input_args.kwargs)
+        result = cmp(output, *cmp_args.args, **cmp_args.kwargs)
+    except NotImplementedError as err:
+        result = None
+    except MemoryError:
+        result = Result(False, 0, "Memory Limit Exceeded")
+    except:
+        result = Result(False, 0, traceback.format_exc())
+    finally:
+        if profile: profiler.disable()
+    metrics = {"wall_time": time.perf_counter() - wall_start, "cpu_time": time.thread_time() - cpu_start}
+    if profile:
+        metrics["profile"] = summarize_profile(profiler, profile, profile_stacks)
+    if trace_memory:
+        metrics["tracemalloc_peak"] = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+    metrics["call_counts"] = clear_fetched_call_counts()
+    metrics["loaded_modules"] = sorted(loaded_modules)
+    return result, metrics
+
+def run_test(fn: Callable, input_args: Arguments, cmp: Callable, cmp_args: Arguments, timeout: 10, trace_memory: bool = False,
+             profile: int = 0, profile_stacks: bool = False) -> Tuple[Union[Result, None], Metrics]:
     def _call(queue: Queue):
-        try:
-            output = fn(*input_args.args, **input_args.kwargs)
-            result = cmp(output, *cmp_args.args, **cmp_args.kwargs)
-        except NotImplementedError as err:
-            result = None
-        except:
-            result = Result(False, 0, traceback.format_exc())
-        queue.put(result)
+        queue.put(measure_call(fn, input_args, cmp, cmp_args, trace_memory, profile, profile_stacks))
     queue = Queue()
     thread = threading.Thread(target=_call, args=(queue,), daemon=True)
     thread.start()
@@ -53,11 +106,114 @@ def run_test(fn: Callable, input_args: Arguments, cmp: Callable, cmp_args: Argum
             result = Result(False, 0, "Timeout")
         else:
             result = Result(False, 0, "Run Failed")
+        metrics = {"wall_time": elapsed}
     else:
-        result = queue.get()
+        result, metrics = queue.get()
     raise_exception_in_thread(thread, KeyboardInterrupt())
+    if profile and "profile" not in metrics:
+        # The interrupted test still sends its profile (which shows where the time went before the timeout)
+        thread.join(1)
+        if not queue.empty():
+            metrics["profile"] = queue.get()[1].get("profile")
     del thread
-    return result
+    return result, metrics
+
+# The limits of the sandbox where each test case runs in its own child process
+@dataclass
+class Sandbox:
+    memory_limit: int = 4096    # The address space limit of the child process in MB (0 for no limit)
+
+# The options that change how each test case runs (they are sent to the worker processes too)
+@dataclass
+class TestOptions:
+    sandbox: Union[Sandbox, None] = None    # If None, the test cases run in a thread of the current process
+    trace_memory: bool = False              # Measure the peak allocated memory with tracemalloc (slows down the tests)
+    profile: int = 0                        # The number of hotspots of cProfile to report for each test case (0 to disable the profiler)
+    profile_directory: Union[str, None] = None  # The folder of the collapsed stacks of the profile (for flamegraphs), None to skip them
+    fixture_cache: bool = False             # Load the evaluated inputs from the fixture cache (see helpers/fixtures.py)
+    incremental: bool = False               # Find the source files of each test case for the result cache (see helpers/results.py)
+
+# The fixture cache of the current process (created when it is first needed)
+fixture_cache: Union[FixtureCache, None] = None
+
+def get_fixture_cache() -> FixtureCache:
+    global fixture_cache
+    if fixture_cache is None:
+        fixture_cache = FixtureCache()
+    return fixture_cache
+
+# The result cache of the incremental mode (only used by the main process)
+result_cache: Union[ResultCache, None] = None
+
+def sandbox_supported() -> bool:
+    return resource is not None and "fork" in multiprocessing.get_all_start_methods()
+
+def set_limit(limit: int, value: int):
+    _, hard = resource.getrlimit(limit)
+    if hard != resource.RLIM_INFINITY: value = min(value, hard)
+    try:
+        resource.setrlimit(limit, (value, hard))
+    except (ValueError, OSError):
+        pass
+
+def run_test_in_sandbox(fn: Callable, input_args: Arguments, cmp: Callable, cmp_args: Arguments, timeout: float, sandbox: Sandbox,
+                        trace_memory: bool = False, profile: int = 0, profile_stacks: bool = False) -> Tuple[Union[Result, None], Metrics]:
+    '''
+        Runs the test in a forked child process (so the functions and arguments do not need to be sent to it) where:
+        - The CPU time is limited to the timeout (rounded up) plus one second using RLIMIT_CPU.
+        - The address space is limited to "sandbox.memory_limit" MB using RLIMIT_AS.
+        The child sends the result and its peak RSS back over a pipe. If no result arrives before the timeout,
+        the child is killed, so a runaway test does not keep running in the background and slow down the next tests.
+        The child runs in its own process group, so the processes that the test started (e.g. a process pool) are killed with it.
+    '''
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    def _call():
+        receiver.close()
+        os.setpgid(0, 0)
+        cpu_limit = math.ceil(timeout) + 1
+        set_limit(resource.RLIMIT_CPU, cpu_limit)
+        if sandbox.memory_limit > 0:
+            set_limit(resource.RLIMIT_AS, sandbox.memory_limit << 20)
+        result, metrics = measure_call(fn, input_args, cmp, cmp_args, trace_memory, profile, profile_stacks)
+        metrics["peak_rss"] = peak_rss()
+        sender.send((result, metrics))
+        sender.close()
+    # Flush the buffered output, otherwise the child would print it again when it exits
+    sys.stdout.flush()
+    sys.stderr.flush()
+    # The child is not a daemon since daemonic processes cannot start processes (it is always killed below anyway)
+    child = multiprocessing.get_context("fork").Process(target=_call)
+    start = time.perf_counter()
+    child.start()
+    try:
+        os.setpgid(child.pid, child.pid) # Also set by the child, whichever runs first
+    except OSError:
+        pass
+    sender.close()
+    status, result, metrics = "Timeout", None, {}
+    try:
+        if receiver.poll(timeout):
+            try:
+                result, metrics = receiver.recv()
+                status = "Done"
+            except EOFError: # The child died before sending the result
+                status = "Died"
+    finally:
+        child.join(0.1 if status == "Done" else 0)
+        try:
+            os.killpg(child.pid, signal.SIGKILL)
+        except OSError: # The group is empty
+            pass
+        if child.is_alive():
+            child.kill()
+        child.join()
+        receiver.close()
+    if status == "Done":
+        return result, metrics
+    metrics = {"wall_time": time.perf_counter() - start}
+    if status == "Died" and child.exitcode != -getattr(signal, "SIGXCPU", signal.SIGKILL):
+        return Result(False, 0, f"Run Failed (exit code {child.exitcode})"), metrics
+    return Result(False, 0, "Timeout"), metrics
 
 def default_comparator(output, expected):
     success = output == expected
@@ -77,8 +233,21 @@ def approximate_comparator(output, expected):
         message = f"Expected {expected} but got {output}"
     return Result(success, grade, message)
 
+def print_metrics(metrics: Metrics):
+    if "peak_rss" in metrics:
+        print(f"Peak RSS: {metrics['peak_rss'] / 1024:.1f} MB")
+
+# Prints the hotspots of the profile and saves its collapsed stacks as "<directory>/<testcases folder>_<testcase name>.folded"
+def report_profile(profile: Union[Dict[str, Any], None], test_case: Dict[str, Any], directory: Union[str, None]):
+    if profile is None: return
+    print_hotspots(profile["hotspots"])
+    if directory and "stacks" in profile:
+        name = os.path.splitext(os.path.relpath(test_case["__path__"], root))[0].replace(os.sep, "_")
+        write_collapsed_stacks(os.path.join(directory, name + ".folded"), profile["stacks"])
+
 class Problem:
     def __init__(self, **kwargs) -> None:
+        self.config = kwargs # Used to create the problem again in the worker processes
         self.name = kwargs.get("name", "Unnamed Problem")
         self.testcases_path = kwargs.get("testcases_path", self.name)
         self.default_fn = lambda x: x
@@ -89,46 +258,116 @@ class Problem:
         self.default_timeout = kwargs.get("timeout", 1)
         self.grade = 0
         self.maximum_grade = 0
+        self.pending: Union[Tuple[List[Dict[str, Any]], List[Future]], None] = None
     
-    def run(self, is_debug: bool = False, pattern: str = "*", time_scale: float = 1):
-        print(f"Problem: {self.name}")
+    def run_test_case(self, test_case: Dict[str, Any], is_debug: bool = False, time_scale: float = 1,
+                      options: Union[TestOptions, None] = None) -> Tuple[Union[Result, None], Metrics]:
+        options = options or TestOptions()
+        clear_loaded_modules()
+        timeout = test_case.get("timeout", self.default_timeout)
+        fn = self.default_fn
+        if "function" in test_case: fn = eval(test_case["function"])
+        evaluate = lambda expression: eval(expression)
+        if options.fixture_cache:
+            cache, path = get_fixture_cache(), test_case.get("__path__", "")
+            evaluate = lambda expression: cache.evaluate(expression, path, lambda expression: eval(expression))
+        input_args = test_case.get("input_args", [])
+        input_kwargs = test_case.get("input_kwargs", {})
+        fn_args = Arguments(
+            [evaluate(arg) for arg in input_args], {key:evaluate(value) for key, value in input_kwargs.items()})
+        cmp = self.default_cmp
+        if "comparator" in test_case: cmp = eval(test_case["comparator"])
+        cmp_args = Arguments(
+            [evaluate(arg) for arg in test_case.get("comparison_args", [])],
+            {key:evaluate(value) for key, value in test_case.get("comparison_kwargs", {}).items()})
+        if options.fixture_cache:
+            cache.save([path])
+        if options.sandbox is not None and not is_debug:
+            result, metrics = run_test_in_sandbox(fn, fn_args, cmp, cmp_args, timeout * time_scale, options.sandbox,
+                                                  options.trace_memory, options.profile, options.profile_directory is not None)
+        else:
+            result, metrics = run_test(fn, fn_args, cmp, cmp_args, (None if is_debug else timeout * time_scale),
+                                       options.trace_memory, options.profile, options.profile_directory is not None)
+        # The modules loaded by the test (in the sandbox, they are loaded in the child process too)
+        module_names = set(metrics.pop("loaded_modules", [])) | clear_loaded_modules()
+        if options.incremental:
+            values = [fn, cmp, *fn_args.args, *fn_args.kwargs.values(), *cmp_args.args, *cmp_args.kwargs.values()]
+            metrics["source_files"] = sorted(source_files(module_names, values, source_roots()))
+        return result, metrics
+
+    # Returns the key of the test case in the result cache and its cached (result, metrics) if they are still valid
+    def lookup(self, test_case: Dict[str, Any], is_debug: bool, time_scale: float,
+               options: TestOptions) -> Tuple[Union[str, None], Union[Tuple[Union[Result, None], Metrics], None]]:
+        if result_cache is None or is_debug or options.profile: return None, None # A profiled run runs every test case
+        time_limit = test_case.get("timeout", self.default_timeout) * time_scale
+        key = result_cache.key(test_case, self.config, time_limit, options.sandbox, options.trace_memory)
+        return key, result_cache.get(key)
+
+    # Starts running the test cases in the worker processes, "run" will wait for them and print their results in order
+    def submit(self, executor: Executor, is_debug: bool = False, pattern: str = "*", time_scale: float = 1, options: Union[TestOptions, None] = None):
         test_cases = get_test_cases(os.path.join(root, self.testcases_path), pattern)
+        lookups = [self.lookup(test_case, is_debug, time_scale, options or TestOptions()) for test_case in test_cases]
+        futures = [None if cached is not None else executor.submit(run_test_case_in_worker, self.config, test_case, is_debug, time_scale, options)
+                   for test_case, (_, cached) in zip(test_cases, lookups)]
+        self.pending = (test_cases, futures, lookups)
+
+    def run(self, is_debug: bool = False, pattern: str = "*", time_scale: float = 1, options: Union[TestOptions, None] = None):
+        options = options or TestOptions()
+        print(f"Problem: {self.name}")
+        if self.pending is None:
+            test_cases, futures = get_test_cases(os.path.join(root, self.testcases_path), pattern), None
+            lookups = [self.lookup(test_case, is_debug, time_scale, options) for test_case in test_cases]
+        else:
+            (test_cases, futures, lookups), self.pending = self.pending, None
         self.grade = 0
         self.maximum_grade = 0
+        self.records: List[TestRecord] = []
         for test_index, test_case in enumerate(test_cases):
             description = test_case.get("description", f"Test Case {test_index+1}")
             timeout = test_case.get("timeout", self.default_timeout)
+            key, cached = lookups[test_index]
             if is_debug:
                 print(f"{test_index+1}: {description} :: time-limit is turned off in debug mode")
             else:
-                print(f"{test_index+1}: {description} :: time-limit = {timeout*time_scale} sec")
-            fn = self.default_fn
-            if "function" in test_case: fn = eval(test_case["function"])
+                print(f"{test_index+1}: {description} :: time-limit = {timeout*time_scale} sec" + (" (cached)" if cached is not None else ""))
             input_args = test_case.get("input_args", [])
             input_kwargs = test_case.get("input_kwargs", {})
-            fn_args = Arguments(
-                [eval(arg) for arg in input_args], {key:eval(value) for key, value in input_kwargs.items()})
-            cmp = self.default_cmp
-            if "comparator" in test_case: cmp = eval(test_case["comparator"])
-            cmp_args = Arguments(
-                [eval(arg) for arg in test_case.get("comparison_args", [])],
-                {key:eval(value) for key, value in test_case.get("comparison_kwargs", {}).items()})
             weight = test_case.get("weight", 1)
             maximum_grade = self.weight * weight * test_case.get("maximum_grade", 1)
             self.maximum_grade += maximum_grade
-            result = run_test(fn, fn_args, cmp, cmp_args, (None if is_debug else timeout * time_scale))
+            if cached is not None:
+                result, metrics = cached
+            elif futures is None:
+                result, metrics = self.run_test_case(test_case, is_debug, time_scale, options)
+            else:
+                try:
+                    result, metrics = futures[test_index].result()
+                except Exception: # The worker process died (for example, it crashed or ran out of memory)
+                    result, metrics = Result(False, 0, "Run Failed"), {}
+            profile = metrics.pop("profile", None)
+            sources = metrics.pop("source_files", None)
+            if key is not None and cached is None and sources is not None:
+                result_cache.put(key, test_case, result, metrics, sources + [os.path.relpath(__file__)])
+            time_limit = None if is_debug else timeout * time_scale
             if result is None:
                 print("Function is not implemented yet")
+                self.records.append(make_test_record(test_index+1, description, "not implemented", 0, maximum_grade, "", time_limit, metrics))
                 continue
             grade = self.weight * weight * result.grade
+            self.records.append(make_test_record(test_index+1, description, "pass" if result.success else "fail",
+                                                 grade, maximum_grade, result.message, time_limit, metrics))
             if result.success:
                 print(f"Result: PASS {grade}/{maximum_grade}", end="")
                 if result.message:
                     print(" -", result.message)
                 else:
                     print()
+                print_metrics(metrics)
+                report_profile(profile, test_case, options.profile_directory)
             else:
                 print(f"Result: FAIL {grade}/{maximum_grade} - {result.message}")
+                print_metrics(metrics)
+                report_profile(profile, test_case, options.profile_directory)
                 if input_args:
                     print("Input positional arguments:")
                     for arg in input_args: print(f"- {arg}")
@@ -139,6 +378,20 @@ class Problem:
             self.grade += grade
         print(f"Total {self.grade}/{self.maximum_grade}")
 
+# Runs a test case in a worker process (the problem is created again since its functions cannot be sent between processes)
+def run_test_case_in_worker(config: Dict[str, Any], test_case: Dict[str, Any], is_debug: bool, time_scale: float,
+                            options: Union[TestOptions, None]) -> Tuple[Union[Result, None], Metrics]:
+    return Problem(**config).run_test_case(test_case, is_debug, time_scale, options)
+
+def create_executor(jobs: int, solution: str) -> Executor:
+    '''
+        Creates a pool of "jobs" worker processes where each worker runs a single test case then exits,
+        so every test case runs in a fresh process (with the solution path set) like the first test case of a serial run.
+    '''
+    options = {"max_tasks_per_child": 1} if sys.version_info >= (3, 11) else {}
+    return ProcessPoolExecutor(jobs, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=set_solution_path, initargs=(solution,), **options)
+
 def main(args: argparse.Namespace):
     time_scale = args.timescale
     if time_scale.lower() == "default":
@@ -173,19 +426,97 @@ def main(args: argparse.Namespace):
             pass
     else:
         problems = [(problem, "*") for index, problem in enumerate(problems)]
-    for problem, pattern in problems:
-        problem.run(args.debug, pattern, time_scale)
-        print()
-        total_grade += problem.grade
-        maximum_grade += problem.maximum_grade
+    options = TestOptions(trace_memory=args.trace_memory, fixture_cache=args.fixture_cache,
+                          profile=args.profile or (10 if args.profile_stacks else 0), profile_directory=args.profile_stacks)
+    if args.incremental and not args.debug:
+        global result_cache
+        result_cache = ResultCache(solution=args.solution)
+        options.incremental = True
+    if args.sandbox and not args.debug:
+        if sandbox_supported():
+            options.sandbox = Sandbox(args.memory_limit)
+        else:
+            print("The sandbox is not supported on this platform (it needs the resource module and fork), the tests will run in threads\n")
+    # The test cases run in parallel (except in debug mode) but the results are printed in the order of a serial run
+    executor = create_executor(args.jobs, args.solution) if args.jobs > 1 and not args.debug else None
+    try:
+        if executor is not None:
+            for problem, pattern in problems:
+                problem.submit(executor, args.debug, pattern, time_scale, options)
+        for problem, pattern in problems:
+            problem.run(args.debug, pattern, time_scale, options)
+            print()
+            total_grade += problem.grade
+            maximum_grade += problem.maximum_grade
+            if result_cache is not None: result_cache.save()
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
     print(f"Problem Set Total {total_grade}/{maximum_grade}\n")
+    if fixture_cache is not None:
+        print(f"Fixture cache: {fixture_cache.hits} hits, {fixture_cache.misses} misses\n")
+    if result_cache is not None:
+        print(f"Result cache: {result_cache.hits} cached, {result_cache.misses} ran\n")
+    # The solution modules are cached in the process that loads them (so only the serial tests are counted)
+    statistics = solution_module_statistics
+    if args.solution and statistics["executions"] > 0:
+        print(f"Solution modules: {statistics['executions']} executions ({statistics['execution_time']:.3f} seconds), "
+              f"{statistics['hits']} cache hits (about {statistics['saved_time']:.3f} seconds saved)\n")
+    if args.report is not None:
+        path = args.report_path or DEFAULT_REPORT_PATHS[args.report]
+        records: List[ProblemRecord] = [
+            {"name": problem.name, "grade": problem.grade, "maximum_grade": problem.maximum_grade, "tests": problem.records}
+            for problem, _ in problems
+        ]
+        write_report(args.report, path, name, records, args.report_measurements)
+        print(f"The {args.report} report is saved to {path}\n")
     exit(total_grade)
 
+def watch(solution: str, interval: float = 1):
+    '''
+        Runs the autograder (with the same arguments) in incremental mode, then runs it again whenever a python file,
+        a testcase or a dependency of a cached result changes, until it is interrupted (Ctrl+C).
+        Each run is a new process (so the changed modules are imported again) where only the affected test cases run.
+    '''
+    command = [sys.executable, sys.argv[0]] + [arg for arg in sys.argv[1:] if arg != "--watch"]
+    if "--incremental" not in command: command.append("--incremental")
+    set_solution_path(solution)
+    roots = source_roots()
+    try:
+        while True:
+            subprocess.run(command)
+            dependencies = ResultCache().dependencies()
+            snapshot = snapshot_files(roots, dependencies)
+            print("Watching for changes (press Ctrl+C to stop)...")
+            current = snapshot
+            while current == snapshot:
+                time.sleep(interval)
+                current = snapshot_files(roots, dependencies)
+            changed = sorted(path for path in current.keys() | snapshot.keys() if current.get(path) != snapshot.get(path))
+            print(f"Changed: {', '.join(changed)}\n")
+    except KeyboardInterrupt:
+        pass
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Automatically grades the solutions for the problem set")
     parser.add_argument("--question", "-q", default="all", help="choose the question(s) to include in the grading (or prefix with ~ to exclude). A question number can be followed by a slash / followed by a glob pattern to filter the testcases.")
     parser.add_argument("--debug", "-d", action="store_true", help="Disables timeout to enable debugging via the autograder")
     parser.add_argument("--timescale", "-t", type=str, default="default", help="A scaling factor for the timeout")
     parser.add_argument("--solution", "-s", default="")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="The number of worker processes that run the test cases in parallel (each test case runs in a fresh process)")
+    parser.add_argument("--sandbox", action="store_true", help="Runs each test case in a child process with CPU and memory limits that is killed on timeout, and reports its peak RSS")
+    parser.add_argument("--memory-limit", type=int, default=Sandbox.memory_limit, help="The address space limit of the sandbox in MB (0 for no limit)")
+    parser.add_argument("--report", choices=REPORT_FORMATS, default=None, help="Saves the grade, message, time, memory and call counts of every test case in a report")
+    parser.add_argument("--report-path", default=None, help="The path of the report (default: report.json or report.xml)")
+    parser.add_argument("--report-measurements", action="store_true", help="Also saves the times and memory of every test case in the json report (they change in every run, so they are left out by default)")
+    parser.add_argument("--fixture-cache", action="store_true", help="Loads the evaluated inputs of the test cases from a cache (in .fixture_cache) if the test cases and their data files did not change")
+    parser.add_argument("--trace-memory", action="store_true", help="Measures the peak allocated memory of each test case with tracemalloc (slows down the tests)")
+    parser.add_argument("--profile", type=int, nargs="?", const=10, default=0, metavar="N", help="Profiles each test case with cProfile and prints its N (default: 10) functions with the highest cumulative time")
+    parser.add_argument("--profile-stacks", default=None, metavar="FOLDER", help="Also saves the collapsed stacks of each profiled test case in the folder (for flamegraph tools)")
+    parser.add_argument("--incremental", action="store_true", help="Reuses the cached results (in .result_cache) of the test cases whose testcases, data files and source files did not change")
+    parser.add_argument("--watch", action="store_true", help="Grades again in incremental mode whenever a file changes")
     args = parser.parse_args()
-    main(args)
\ No newline at end of file
+    if args.watch:
+        watch(args.solution)
+    else:
+        main(args)
\ No newline at end of file
@@ -0,0 +1,289 @@
+import argparse, itertools, os, random, statistics, time
+from typing import Any, Callable, Iterable, List, Tuple
+
+from helpers.test_tools import read_text_file, read_word_list
+
+MB = 1 << 20
+
+# Repeats the text (separated by spaces) until it is (almost) "size" characters long
+# The result always ends at a word boundary so that the word counts stay meaningful
+def scale_text(text: str, size: int) -> str:
+    text = text.strip()
+    repeats = max(1, size // (len(text) + 1))
+    return " ".join([text] * repeats)
+
+# Calls the function "repeats" times and returns the last output and the median elapsed time
+def time_call(fn: Callable, *args: Any, repeats: int = 1) -> Tuple[Any, float]:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        output = fn(*args)
+        timings.append(time.perf_counter() - start)
+    return output, statistics.median(timings)
+
+def benchmark_caesar(args: argparse.Namespace):
+    from caesar import caesar_dechiper, caesar_dechiper_ranked
+    dictionary = read_word_list(args.dictionary)
+    print(f"{'file':<28}{'size (MB)':>10}{'reference (s)':>16}{'ranked (s)':>12}{'speedup':>10}")
+    for index in args.texts:
+        path = f"data/text{index}_ciphered.txt"
+        original = read_text_file(path)
+        for size in args.sizes:
+            ciphered = scale_text(original, int(size * MB))
+            ranked, ranked_time = time_call(caesar_dechiper_ranked, ciphered, dictionary, args.candidates, repeats=args.repeats)
+            if size <= args.reference_limit:
+                reference, reference_time = time_call(caesar_dechiper, ciphered, dictionary, repeats=args.repeats)
+                if reference != ranked:
+                    print(f"Mismatch on '{path}' scaled to {size} MB: expected shift {reference[1]}, got {ranked[1]}")
+                print(f"{path:<28}{size:>10g}{reference_time:>16.3f}{ranked_time:>12.3f}{reference_time/ranked_time:>9.1f}x")
+            else:
+                print(f"{path:<28}{size:>10g}{'-':>16}{ranked_time:>12.3f}{'-':>10}")
+            del ciphered
+
+# Creates short ciphered messages from random windows of the original texts with random shifts
+def generate_messages(count: int, min_words: int = 5, max_words: int = 15, seed: int = 0) -> List[str]:
+    from caesar import ALPHABET
+    rng = random.Random(seed)
+    words = [word for index in range(1, 5) for word in read_text_file(f"data/text{index}_original.txt").split()]
+    tables = [str.maketrans(ALPHABET, ALPHABET[shift:] + ALPHABET[:shift]) for shift in range(26)]
+    messages = []
+    for _ in range(count):
+        length = rng.randint(min_words, max_words)
+        start = rng.randrange(len(words) - length)
+        messages.append(" ".join(words[start:start+length]).translate(rng.choice(tables)))
+    return messages
+
+def benchmark_caesar_batch(args: argparse.Namespace):
+    from caesar import caesar_dechiper
+    from caesar_batch import caesar_dechiper_batch
+    dictionary = read_word_list(args.dictionary)
+    messages = generate_messages(args.messages)
+    reference, reference_time = time_call(lambda: [caesar_dechiper(message, dictionary) for message in messages])
+    print(f"{'workers':>8}{'time (s)':>12}{'messages/s':>14}")
+    print(f"{'serial':>8}{reference_time:>12.3f}{len(messages)/reference_time:>14.0f}  (caesar_dechiper one at a time)")
+    for workers in args.workers:
+        results, elapsed = time_call(caesar_dechiper_batch, messages, dictionary, workers, args.candidates, repeats=args.repeats)
+        if args.candidates == 26 and results != reference:
+            print(f"Mismatch with {workers} workers")
+        print(f"{workers:>8}{elapsed:>12.3f}{len(messages)/elapsed:>14.0f}")
+
+# A stream of "count" skewed (Pareto distributed) integers made by repeating a random block
+def generate_stream(count: int, block_size: int = 1000000, seed: int = 0) -> Iterable[int]:
+    rng = random.Random(seed)
+    block = [int(rng.paretovariate(0.8)) for _ in range(min(count, block_size))]
+    repeats, remainder = divmod(count, len(block))
+    return itertools.chain(itertools.chain.from_iterable(itertools.repeat(block, repeats)), block[:remainder])
+
+def benchmark_histogram(args: argparse.Namespace):
+    from histogram import histogram
+    from histogram_stream import exact_histogram, SpaceSaving, CountMinSketch, HyperLogLog
+    count = int(args.items)
+    print(f"{'method':<32}{'time (s)':>12}{'items/s':>14}  result")
+    def report(name: str, elapsed: float, result: str):
+        print(f"{name:<32}{elapsed:>12.3f}{count/elapsed:>14.0f}  {result}")
+
+    if count <= args.list_limit:
+        values = list(generate_stream(count))
+        reference, elapsed = time_call(histogram, values)
+        report("histogram (dict over a list)", elapsed, f"{len(reference)} distinct values")
+        del values
+    exact, elapsed = time_call(lambda: exact_histogram(generate_stream(count)))
+    report("exact (Counter over a stream)", elapsed, f"{len(exact)} distinct values")
+    truth = sorted(exact.items(), key=lambda item: -item[1])[:args.k]
+    del exact
+
+    summary = SpaceSaving(args.capacity)
+    _, elapsed = time_call(summary.update, generate_stream(count))
+    worst = max(abs(estimated - dict(truth).get(value, 0)) for value, estimated, _ in summary.top(args.k))
+    report(f"space-saving ({args.capacity} counters)", elapsed, f"top-{args.k} worst count error {worst} (bound {count/args.capacity:.0f})")
+
+    sketch = CountMinSketch(args.width, args.depth)
+    _, elapsed = time_call(sketch.update, generate_stream(count))
+    worst = max(sketch.count(value) - true_count for value, true_count in truth)
+    report(f"count-min ({args.depth}x{args.width})", elapsed, f"top-{args.k} worst count error {worst} (bound {2.718*count/args.width:.0f})")
+
+    distinct = HyperLogLog(args.precision)
+    _, elapsed = time_call(distinct.update, generate_stream(count))
+    report(f"hyperloglog (precision {args.precision})", elapsed, f"{distinct.count()} distinct values (estimated)")
+
+def benchmark_histogram_files(args: argparse.Namespace):
+    import tempfile
+    from histogram_stream import exact_histogram, read_lines
+    from histogram_parallel import parallel_histogram
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        values = generate_stream(int(args.items))
+        per_file = int(args.items) // args.files
+        for index in range(args.files):
+            path = os.path.join(directory, f"values{index}.txt")
+            with open(path, 'w') as f:
+                f.write("\n".join(map(str, itertools.islice(values, per_file))))
+            paths.append(path)
+        reference, reference_time = time_call(lambda: exact_histogram(itertools.chain.from_iterable(map(read_lines, paths))))
+        print(f"{'workers':>8}{'mode':>10}{'time (s)':>12}{'speedup':>10}")
+        print(f"{'serial':>8}{'strings':>10}{reference_time:>12.3f}{1:>9.1f}x")
+        integer_reference = {int(value): count for value, count in reference.items()}
+        for workers in args.workers:
+            for integers in (False, True):
+                result, elapsed = time_call(parallel_histogram, paths, workers, int(args.chunk_size * MB), integers, repeats=args.repeats)
+                if result != (integer_reference if integers else reference):
+                    print(f"Mismatch with {workers} workers")
+                print(f"{workers:>8}{'integers' if integers else 'strings':>10}{elapsed:>12.3f}{reference_time/elapsed:>9.1f}x")
+
+def benchmark_locate_many(args: argparse.Namespace):
+    from grid import Grid
+    from locator import locate, locate_many
+    rng = random.Random(0)
+    grid = Grid.GridFromArray([[rng.randrange(args.values) for _ in range(args.size)] for _ in range(args.size)])
+    items = list(range(args.items))
+    reference, reference_time = time_call(lambda: {item: locate(grid, item) for item in items}, repeats=args.repeats)
+    result, elapsed = time_call(locate_many, grid, items, repeats=args.repeats)
+    if result != reference:
+        print("Mismatch between locate and locate_many")
+    print(f"{args.size}x{args.size} grid, {args.items} items")
+    print(f"repeated locate: {reference_time:.3f} s")
+    print(f"locate_many:     {elapsed:.3f} s ({reference_time/elapsed:.1f}x faster)")
+
+def benchmark_college_store(args: argparse.Namespace):
+    import csv, tempfile
+    from college import Course, Student
+    from college_store import CollegeStore
+    from gpa_calculator import calculate_gpa
+    rng = random.Random(0)
+    grades = list(Course.GRADE_POINTS)
+    per_student = args.courses_per_student
+    student_count = int(args.rows) // per_student
+    with tempfile.TemporaryDirectory() as directory:
+        paths = {name: os.path.join(directory, f"{name}.csv") for name in ("students", "courses", "grades")}
+        with open(paths["students"], 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "name"])
+            writer.writerows((f"S{index}", f"Student {index}") for index in range(student_count))
+        with open(paths["courses"], 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "name", "hours"])
+            writer.writerows((f"C{index}", f"Course {index}", rng.randint(1, 4)) for index in range(args.courses))
+        with open(paths["grades"], 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["student_id", "course_id", "grade"])
+            for index in range(student_count):
+                writer.writerows((f"S{index}", f"C{course}", rng.choice(grades)) for course in rng.sample(range(args.courses), per_student))
+
+        store = CollegeStore(os.path.join(directory, "college.db"))
+        _, elapsed = time_call(store.import_csv, paths["students"], paths["courses"], paths["grades"])
+        print(f"import {student_count * per_student} grade rows: {elapsed:.3f} s")
+
+        # The in-memory objects for the comparison with calculate_gpa
+        courses = {course_id: Course(course_id, name, hours) for course_id, name, hours in store.connection.execute("SELECT * FROM courses")}
+        for student_id, course_id, grade in store.connection.execute("SELECT * FROM grades"):
+            courses[course_id].grades[student_id] = grade
+        courses = list(courses.values())
+        student = Student("S0", "Student 0")
+
+        expected, elapsed = time_call(calculate_gpa, student, courses, repeats=args.repeats)
+        print(f"calculate_gpa over all the in-memory courses: {elapsed*1000:.3f} ms")
+        gpa, elapsed = time_call(store.gpa, "S0", repeats=args.repeats)
+        print(f"store.gpa (indexed SQL query): {elapsed*1000:.3f} ms")
+        adapted, elapsed = time_call(lambda: calculate_gpa(student, store.courses_of(student)), repeats=args.repeats)
+        print(f"calculate_gpa over store.courses_of: {elapsed*1000:.3f} ms")
+        if abs(gpa - expected) > 1e-9 or abs(adapted - expected) > 1e-9:
+            print(f"Mismatch: expected {expected}, got {gpa} and {adapted}")
+        _, elapsed = time_call(store.top, 10, repeats=args.repeats)
+        print(f"store.top(10): {elapsed:.3f} s")
+        _, elapsed = time_call(store.ranking, repeats=args.repeats)
+        print(f"store.ranking(): {elapsed:.3f} s")
+        store.close()
+
+def benchmark_grid_count(args: argparse.Namespace):
+    from grid import Grid
+    from locator import locate
+    rng = random.Random(0)
+    grid = Grid.GridFromArray([[rng.randrange(args.values) for _ in range(args.size)] for _ in range(args.size)])
+    rectangles = []
+    for _ in range(args.queries):
+        x0, x1 = sorted(rng.randrange(args.size + 1) for _ in range(2))
+        y0, y1 = sorted(rng.randrange(args.size + 1) for _ in range(2))
+        rectangles.append((rng.randrange(args.values), x0, y0, x1, y1))
+    print(f"{args.size}x{args.size} grid, {args.values} distinct values")
+
+    def locate_count(value, x0, y0, x1, y1):
+        return sum(1 for x, y in locate(grid, value) if x0 <= x < x1 and y0 <= y < y1)
+    references = rectangles[:args.reference_queries]
+    expected, elapsed = time_call(lambda: [locate_count(*rectangle) for rectangle in references])
+    print(f"locate and filter: {elapsed/len(references):.3f} s per query")
+
+    _, elapsed = time_call(lambda: [grid.count(value, 0, 0, 1, 1) for value in range(args.values)])
+    print(f"building the summed-area tables (first query of each value): {elapsed/args.values:.3f} s per value")
+    counts, elapsed = time_call(lambda: [grid.count(*rectangle) for rectangle in rectangles])
+    print(f"summed-area count: {elapsed/len(rectangles)*1e6:.2f} us per query")
+    if counts[:len(expected)] != expected:
+        print("Mismatch between the summed-area counts and locate")
+
+    for _ in range(args.updates):
+        grid[rng.randrange(args.size), rng.randrange(args.size)] = rng.randrange(args.values)
+    _, elapsed = time_call(lambda: [grid.count(*rectangle) for rectangle in rectangles])
+    print(f"summed-area count after {args.updates} patched updates: {elapsed/len(rectangles)*1e6:.2f} us per query (including rebuilds)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks the solutions of the problem set on large inputs")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    caesar_parser = subparsers.add_parser("caesar", help="compare the reference and the frequency-ranked Caesar deciphers")
+    caesar_parser.add_argument("--texts", "-x", type=int, nargs="+", default=[1, 2, 3, 4], help="the indices of the ciphered texts in the data folder")
+    caesar_parser.add_argument("--sizes", "-s", type=float, nargs="+", default=[1, 10, 100], help="the sizes (in MB) to which the texts are scaled")
+    caesar_parser.add_argument("--dictionary", "-d", default="data/english.txt", help="the path to the word list")
+    caesar_parser.add_argument("--candidates", "-c", type=int, default=3, help="the number of shifts scored against the dictionary")
+    caesar_parser.add_argument("--reference-limit", "-l", type=float, default=1, help="the largest size (in MB) on which the slow reference decipher is run")
+    caesar_parser.add_argument("--repeats", "-r", type=int, default=1, help="the number of timed runs (the median is reported)")
+    caesar_parser.set_defaults(run=benchmark_caesar)
+
+    batch_parser = subparsers.add_parser("caesar-batch", help="measure the throughput of the batch Caesar decipher against the number of workers")
+    batch_parser.add_argument("--messages", "-m", type=int, default=20000, help="the number of generated short messages")
+    batch_parser.add_argument("--workers", "-w", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1}), help="the worker counts to measure")
+    batch_parser.add_argument("--dictionary", "-d", default="data/english.txt", help="the path to the word list")
+    batch_parser.add_argument("--candidates", "-c", type=int, default=26, help="the number of shifts scored against the dictionary")
+    batch_parser.add_argument("--repeats", "-r", type=int, default=1, help="the number of timed runs (the median is reported)")
+    batch_parser.set_defaults(run=benchmark_caesar_batch)
+
+    histogram_parser = subparsers.add_parser("histogram", help="compare the exact histogram with the bounded-memory streaming summaries")
+    histogram_parser.add_argument("--items", "-n", type=float, default=1e8, help="the number of values in the stream")
+    histogram_parser.add_argument("--list-limit", "-l", type=float, default=1e7, help="the largest stream that is materialized as a list for the original histogram")
+    histogram_parser.add_argument("--k", "-k", type=int, default=10, help="the number of heavy hitters to check")
+    histogram_parser.add_argument("--capacity", "-c", type=int, default=1000, help="the number of space-saving counters")
+    histogram_parser.add_argument("--width", type=int, default=2048, help="the width of the count-min sketch")
+    histogram_parser.add_argument("--depth", type=int, default=4, help="the depth of the count-min sketch")
+    histogram_parser.add_argument("--precision", "-p", type=int, default=12, help="the precision of the hyperloglog")
+    histogram_parser.set_defaults(run=benchmark_histogram)
+
+    files_parser = subparsers.add_parser("histogram-files", help="measure the sharded parallel histogram over many files against the number of workers")
+    files_parser.add_argument("--items", "-n", type=float, default=1e7, help="the total number of values (one per line)")
+    files_parser.add_argument("--files", "-f", type=int, default=100, help="the number of generated files")
+    files_parser.add_argument("--chunk-size", "-s", type=float, default=8, help="the maximum shard size (in MB)")
+    files_parser.add_argument("--workers", "-w", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1}), help="the worker counts to measure")
+    files_parser.add_argument("--repeats", "-r", type=int, default=1, help="the number of timed runs (the median is reported)")
+    files_parser.set_defaults(run=benchmark_histogram_files)
+
+    locate_parser = subparsers.add_parser("locate-many", help="compare locate_many with repeated locate calls")
+    locate_parser.add_argument("--size", "-s", type=int, default=1000, help="the width and height of the grid")
+    locate_parser.add_argument("--items", "-i", type=int, default=30, help="the number of located items")
+    locate_parser.add_argument("--values", "-v", type=int, default=100, help="the number of distinct values in the grid")
+    locate_parser.add_argument("--repeats", "-r", type=int, default=1, help="the number of timed runs (the median is reported)")
+    locate_parser.set_defaults(run=benchmark_locate_many)
+
+    store_parser = subparsers.add_parser("college-store", help="measure the sqlite college store on generated grades")
+    store_parser.add_argument("--rows", "-n", type=float, default=1e6, help="the number of grade rows")
+    store_parser.add_argument("--courses", "-c", type=int, default=500, help="the number of courses")
+    store_parser.add_argument("--courses-per-student", "-p", type=int, default=20, help="the number of grades of each student")
+    store_parser.add_argument("--repeats", "-r", type=int, default=3, help="the number of timed runs (the median is reported)")
+    store_parser.set_defaults(run=benchmark_college_store)
+
+    count_parser = subparsers.add_parser("grid-count", help="measure the summed-area rectangle counts of the grid")
+    count_parser.add_argument("--size", "-s", type=int, default=4096, help="the width and height of the grid")
+    count_parser.add_argument("--values", "-v", type=int, default=4, help="the number of distinct values in the grid")
+    count_parser.add_argument("--queries", "-q", type=int, default=10000, help="the number of rectangle queries")
+    count_parser.add_argument("--reference-queries", "-rq", type=int, default=1, help="the number of queries answered with locate for comparison")
+    count_parser.add_argument("--updates", "-u", type=int, default=100, help="the number of cells changed before the last measurement")
+    count_parser.set_defaults(run=benchmark_grid_count)
+
+    args = parser.parse_args()
+    args.run(args)
@@ -0,0 +1,38 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Collection, List, Optional, Sequence
+import os
+from caesar import DechiperResult, caesar_dechiper_ranked
+from dictionary_index import as_word_set
+import utils
+
+# The dictionary set of the current worker process (built once by "init_worker")
+_worker_dictionary: Optional[Collection[str]] = None
+_worker_candidates: int = 26
+
+def init_worker(dictionary: Collection[str], candidates: int):
+    global _worker_dictionary, _worker_candidates
+    _worker_dictionary = as_word_set(dictionary)
+    _worker_candidates = candidates
+
+def decipher_chunk(ciphertexts: List[str]) -> List[DechiperResult]:
+    return [caesar_dechiper_ranked(ciphered, _worker_dictionary, _worker_candidates) for ciphered in ciphertexts]
+
+def caesar_dechiper_batch(ciphertexts: Sequence[str], dictionary: Collection[str], workers: Optional[int] = None,
+                          candidates: int = 26, chunk_size: Optional[int] = None) -> List[DechiperResult]:
+    '''
+        This function deciphers many ciphered texts and returns their DechiperResults in the same order.
+        The dictionary is sent once to each worker process (where its set is built once) then the texts
+        are sent to the workers in chunks of "chunk_size" texts (by default, about 4 chunks per worker).
+        By default, all the 26 shifts are scored so every result is identical to "caesar_dechiper",
+        since the letter frequencies of short messages are not reliable enough to skip shifts.
+        If workers is 1, the texts are deciphered in the current process.
+    '''
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(ciphertexts) <= 1:
+        dictionary_set = as_word_set(dictionary)
+        return [caesar_dechiper_ranked(ciphered, dictionary_set, candidates) for ciphered in ciphertexts]
+    chunk_size = chunk_size or max(1, -(-len(ciphertexts) // (4 * workers)))
+    chunks = [ciphertexts[start:start+chunk_size] for start in range(0, len(ciphertexts), chunk_size)]
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=init_worker, initargs=(dictionary, candidates)) as executor:
+        # "map" yields the results in the order of the chunks
+        return [result for results in executor.map(decipher_chunk, chunks) for result in results]
@@ -0,0 +1,105 @@
+from contextlib import ExitStack
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple, Union
+import mmap, os, shutil, tempfile
+from caesar import ALPHABET, rank_shifts
+from dictionary_index import as_byte_set
+import utils
+
+'''
+    The StreamDechiperResult is the type definition for a tuple containing:
+    - The shift of the cipher (non-negative integer) with the same meaning as in DechiperResult.
+    - The number of words in the deciphered text that are not in the dictionary (non-negative integer).
+    The deciphered text itself is written to the output stream instead of being returned.
+'''
+StreamDechiperResult = Tuple[int, int]
+
+# A ciphered text can be given as a file path or as a binary stream
+CipherSource = Union[str, os.PathLike, BinaryIO]
+
+# The number of bytes read from the source at a time
+CHUNK_SIZE = 1 << 20
+
+LETTERS = [letter.encode() for letter in ALPHABET]
+
+# A bytes translation table for each shift (1 to 26) that shifts every letter "shift" steps to the left
+DECIPHER_BYTE_TABLES: Dict[int, bytes] = {
+    shift: bytes.maketrans(ALPHABET.encode(), (ALPHABET[-shift % 26:] + ALPHABET[:-shift % 26]).encode())
+    for shift in range(1, 27)
+}
+
+# Returns an object with "seek" and "read" over the source and the position at which the text starts
+# Files are memory-mapped, seekable streams are used as they are and other streams are spooled to a temporary file
+def open_source(source: CipherSource, stack: ExitStack) -> Tuple[BinaryIO, int]:
+    if isinstance(source, (str, os.PathLike)):
+        file = stack.enter_context(open(source, 'rb'))
+        if os.fstat(file.fileno()).st_size == 0: # Empty files cannot be memory-mapped
+            return file, 0
+        return stack.enter_context(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)), 0
+    if source.seekable():
+        return source, source.tell()
+    spool = stack.enter_context(tempfile.TemporaryFile())
+    shutil.copyfileobj(source, spool, CHUNK_SIZE)
+    return spool, 0
+
+# Yields the text in chunks of at most "chunk_size" bytes
+def read_chunks(buffer: BinaryIO, start: int, chunk_size: int) -> Iterator[bytes]:
+    buffer.seek(start)
+    while True:
+        chunk = buffer.read(chunk_size)
+        if not chunk: return
+        yield chunk
+
+# Yields the text in blocks that are cut at spaces (the cutting spaces are dropped)
+# So the words of the blocks are exactly the words of the whole text, even if a word crosses a chunk boundary
+# The last block is always yielded (even if empty) to match the behavior of "str.split"
+def read_word_blocks(buffer: BinaryIO, start: int, chunk_size: int) -> Iterator[bytes]:
+    carry = b""
+    for chunk in read_chunks(buffer, start, chunk_size):
+        chunk = carry + chunk
+        cut = chunk.rfind(b" ")
+        if cut == -1:
+            carry = chunk
+            continue
+        yield chunk[:cut]
+        carry = chunk[cut+1:]
+    yield carry
+
+def count_non_dictionary_words(block: bytes, dictionary_set: Set[bytes]) -> int:
+    words = block.lower().split(b" ")
+    return len(words) - sum(map(dictionary_set.__contains__, words))
+
+def caesar_dechiper_stream(source: CipherSource, dictionary: List[str], output: Optional[BinaryIO] = None,
+                           candidates: int = 3, chunk_size: int = CHUNK_SIZE) -> StreamDechiperResult:
+    '''
+        This function deciphers a text that can be much larger than the memory.
+        It takes the source of the ciphered text (a file path or a binary stream), the dictionary
+        and (optionally) a binary stream to which the deciphered text is written.
+        The source is read in chunks of "chunk_size" bytes in three passes:
+        1. The letters are counted to rank the shifts (see "caesar.rank_shifts").
+        2. The "candidates" most likely shifts are scored against the dictionary.
+        3. The text is deciphered with the best shift and written to the output (skipped if there is no output).
+        It returns the same shift and word count as "caesar.caesar_dechiper_ranked" would for the whole text.
+    '''
+    dictionary_set = as_byte_set(dictionary)
+    with ExitStack() as stack:
+        buffer, start = open_source(source, stack)
+
+        counts = [0] * 26
+        for chunk in read_chunks(buffer, start, chunk_size):
+            for index, letter in enumerate(LETTERS):
+                counts[index] += chunk.count(letter)
+        shifts = sorted(rank_shifts(counts)[:max(1, candidates)])
+
+        non_dictionary_word_counts = dict.fromkeys(shifts, 0)
+        for block in read_word_blocks(buffer, start, chunk_size):
+            for shift in shifts:
+                non_dictionary_word_counts[shift] += count_non_dictionary_words(block.translate(DECIPHER_BYTE_TABLES[shift]), dictionary_set)
+        # Since the shifts are sorted, ties go to the smaller shift
+        shift = min(shifts, key=non_dictionary_word_counts.__getitem__)
+
+        if output is not None:
+            table = DECIPHER_BYTE_TABLES[shift]
+            for chunk in read_chunks(buffer, start, chunk_size):
+                output.write(chunk.translate(table))
+
+    return shift, non_dictionary_word_counts[shift]
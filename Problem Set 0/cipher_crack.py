@@ -0,0 +1,138 @@
+from typing import List, Optional, Tuple
+from caesar import rank_shifts
+from ngram_scorer import ALPHABET, CODE_SHIFT_TABLES, NgramScorer, letter_codes, load_default_scorer
+import utils
+
+'''
+    The cracking modes below search the key space of keyed substitution ciphers using the quadgram scorer.
+    Only the lowercase letters are enciphered and every other character (including the uppercase letters) is kept as it is,
+    so the cracking modes only read the lowercase letters of the ciphered text (an uppercase letter is never a key position).
+    - Vigenere: the i-th letter is shifted to the right by the i-th letter of the key (repeated over the text).
+    - Affine: each letter x (as a code from 0 to 25) is enciphered into (a * x + b) mod 26 where a is coprime with 26.
+
+    The VigenereResult is the type definition for a tuple containing:
+    - The deciphered text (string).
+    - The key (a string of lowercase letters where 'a' means no shift).
+    - The quadgram score of the deciphered text (float, higher is better).
+
+    The AffineResult is the type definition for a tuple containing:
+    - The deciphered text (string).
+    - The key (a, b) (a tuple of two integers).
+    - The quadgram score of the deciphered text (float, higher is better).
+'''
+VigenereResult = Tuple[str, str, float]
+AffineResult = Tuple[str, Tuple[int, int], float]
+
+AFFINE_MULTIPLIERS = [1, 3, 5, 7, 9, 11, 15, 17, 19, 21, 23, 25]
+
+# The fewest letters of the sample in each column (one per key letter) for the column statistics to find its shift,
+# so the longest key that can be found is the number of letters divided by this
+MIN_COLUMN_LETTERS = 20
+LETTER_SET = frozenset(ALPHABET)
+
+# Puts the deciphered letters back at the positions of the letters in the original text
+def restore_non_letters(text: str, letters: str) -> str:
+    remaining = iter(letters)
+    return ''.join(next(remaining) if char in LETTER_SET else char for char in text)
+
+def vigenere_decipher(ciphered: str, key: str) -> str:
+    letters = ''.join(char for char in ciphered if char in LETTER_SET)
+    deciphered = [''] * len(key)
+    for position, key_letter in enumerate(key):
+        shift = ALPHABET.index(key_letter)
+        table = str.maketrans(ALPHABET, ALPHABET[-shift:] + ALPHABET[:-shift])
+        deciphered[position] = letters[position::len(key)].translate(table)
+    interleaved = [''] * len(letters)
+    for position, column in enumerate(deciphered):
+        interleaved[position::len(key)] = column
+    return restore_non_letters(ciphered, ''.join(interleaved))
+
+def vigenere_encipher(plain: str, key: str) -> str:
+    inverse_key = ''.join(ALPHABET[-ALPHABET.index(key_letter) % 26] for key_letter in key)
+    return vigenere_decipher(plain, inverse_key)
+
+# The average index of coincidence of the columns when the letters are split into "key_length" columns
+# It is close to 0.066 for English and to 0.038 for uniformly random letters
+def index_of_coincidence(codes: bytes, key_length: int) -> float:
+    total = 0.0
+    for position in range(key_length):
+        column = codes[position::key_length]
+        size = len(column)
+        if size > 1:
+            total += sum(count * (count - 1) for count in (column.count(code) for code in range(26))) / (size * (size - 1))
+    return total / key_length
+
+# Returns the shortest key that repeats into the given key (for example "abcabc" -> "abc")
+def minimal_period(key: str) -> str:
+    for length in range(1, len(key)):
+        if len(key) % length == 0 and key[:length] * (len(key) // length) == key:
+            return key[:length]
+    return key
+
+def crack_vigenere(ciphered: str, scorer: Optional[NgramScorer] = None, max_key_length: int = 20,
+                   candidates: int = 3, sample_size: int = 2000, rounds: int = 5) -> VigenereResult:
+    '''
+        This function finds the Vigenere key of the ciphered text and returns a VigenereResult.
+        1. The "candidates" key lengths with the highest index of coincidence are selected.
+        2. For each length, each key letter starts as the best Caesar shift of its column (chi-square)
+           then the key is improved by hill climbing: every letter of the key is replaced by the letter
+           that maximizes the quadgram score of the first "sample_size" letters, until nothing changes.
+        3. The key with the best score wins and is reduced to its minimal period.
+        The key lengths are capped so that every column has at least MIN_COLUMN_LETTERS letters of the sample,
+        so a key of length n needs a text of at least 20 * n letters (shorter texts are cracked with a shorter key).
+    '''
+    scorer = scorer or load_default_scorer()
+    codes = letter_codes(ciphered, lowercase=False)
+    sample = codes[:sample_size]
+    max_key_length = max(1, min(max_key_length, len(sample) // MIN_COLUMN_LETTERS))
+    lengths = sorted(range(1, max_key_length + 1), key=lambda length: -index_of_coincidence(sample, length))[:candidates]
+
+    best_score, best_key = None, "a"
+    for length in sorted(lengths):
+        shifts = [rank_shifts([sample[position::length].count(code) for code in range(26)])[0] % 26 for position in range(length)]
+        decoded = bytearray(sample)
+        for position, shift in enumerate(shifts):
+            decoded[position::length] = sample[position::length].translate(CODE_SHIFT_TABLES[shift])
+        score = scorer.score_codes(decoded)
+        for _ in range(rounds):
+            improved = False
+            for position in range(length):
+                column = sample[position::length]
+                for shift in range(26):
+                    if shift == shifts[position]: continue
+                    trial = bytearray(decoded)
+                    trial[position::length] = column.translate(CODE_SHIFT_TABLES[shift])
+                    trial_score = scorer.score_codes(trial)
+                    if trial_score > score:
+                        score, decoded, shifts[position], improved = trial_score, trial, shift, True
+            if not improved: break
+        if best_score is None or score > best_score:
+            best_score, best_key = score, ''.join(ALPHABET[shift] for shift in shifts)
+
+    key = minimal_period(best_key)
+    deciphered = vigenere_decipher(ciphered, key)
+    return deciphered, key, scorer.score(deciphered)
+
+def affine_decipher(ciphered: str, a: int, b: int) -> str:
+    inverse = pow(a, -1, 26)
+    return ciphered.translate(str.maketrans(ALPHABET, ''.join(ALPHABET[(inverse * (code - b)) % 26] for code in range(26))))
+
+def affine_encipher(plain: str, a: int, b: int) -> str:
+    return plain.translate(str.maketrans(ALPHABET, ''.join(ALPHABET[(a * code + b) % 26] for code in range(26))))
+
+def crack_affine(ciphered: str, scorer: Optional[NgramScorer] = None, sample_size: int = 2000) -> AffineResult:
+    '''
+        This function tries all the 312 affine keys on the first "sample_size" letters
+        and returns the AffineResult of the key with the best quadgram score.
+    '''
+    scorer = scorer or load_default_scorer()
+    sample = letter_codes(ciphered, lowercase=False)[:sample_size]
+    keys: List[Tuple[float, Tuple[int, int]]] = []
+    for a in AFFINE_MULTIPLIERS:
+        inverse = pow(a, -1, 26)
+        for b in range(26):
+            table = bytes((inverse * (code - b)) % 26 for code in range(26)) + bytes(230)
+            keys.append((scorer.score_codes(sample.translate(table)), (a, b)))
+    _, (a, b) = max(keys, key=lambda item: item[0])
+    deciphered = affine_decipher(ciphered, a, b)
+    return deciphered, (a, b), scorer.score(deciphered)
@@ -1,3 +1,11 @@
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    import numpy as np
+except ImportError: # Gradebook.all_gpas falls back to a pure python pass if numpy is not installed
+    np = None
+
 class Student:
     def __init__(self, id: str, name: str) -> None:
         self.id = id
@@ -14,18 +22,125 @@ class Course:
     def add_grade(self, student: Student, grade: str):
         self.grades[student.id] = grade
     
+    # The points of each grade (any other grade is worth 0 points)
+    GRADE_POINTS = {
+        "A+": 4.0,
+        "A" : 4.0,
+        "A-": 3.7,
+        "B+": 3.5,
+        "B" : 3.3,
+        "B-": 3.0,
+        "C+": 2.7,
+        "C" : 2.5,
+        "C-": 2.3,
+        "D" : 2.0,
+        "F" : 0.0
+    }
+
     @staticmethod
     def convert_grade_to_points(grade: str) -> float:
-        return {
-            "A+": 4.0,
-            "A" : 4.0,
-            "A-": 3.7,
-            "B+": 3.5,
-            "B" : 3.3,
-            "B-": 3.0,
-            "C+": 2.7,
-            "C" : 2.5,
-            "C-": 2.3,
-            "D" : 2.0,
-            "F" : 0.0
-        }.get(grade, 0)
\ No newline at end of file
+        return Course.GRADE_POINTS.get(grade, 0)
+
+
+# The grades are stored as small integer codes: the index of the grade in GRADES
+# and the last code (len(GRADES)) for any other grade (worth 0 points like in "convert_grade_to_points")
+GRADES = list(Course.GRADE_POINTS)
+GRADE_CODES = {grade: code for code, grade in enumerate(GRADES)}
+OTHER_GRADE_CODE = len(GRADES)
+POINTS_BY_CODE = array('d', [Course.GRADE_POINTS[grade] for grade in GRADES] + [0.0])
+
+# A columnar store of the grades of many students in many courses
+# Each grade is a row in three parallel arrays (student index, course index, grade code)
+# and the points and hours are looked up by code and course index from precomputed tables.
+# For each student, it keeps the running sums of (hours * points) and hours which are updated by "add_grade",
+# so the GPA of a student is available in O(1) and the GPAs of all students are computed in a single pass.
+# The grades are also added to the Course objects, so "calculate_gpa" still works on them.
+class Gradebook:
+    def __init__(self, students: Iterable[Student] = (), courses: Iterable[Course] = ()) -> None:
+        self.students: List[Student] = []
+        self.courses: List[Course] = []
+        self.student_indices: Dict[str, int] = {}
+        self.course_indices: Dict[str, int] = {}
+        self.course_hours = array('d')
+        self.grade_students = array('q')
+        self.grade_courses = array('q')
+        self.grade_codes = array('b')
+        self.rows: Dict[Tuple[int, int], int] = {} # (student index, course index) -> row in the grade arrays
+        self.weighted_points = array('d')
+        self.total_hours = array('d')
+        for student in students:
+            self.add_student(student)
+        for course in courses:
+            self.add_course(course)
+
+    def add_student(self, student: Student) -> int:
+        index = self.student_indices.get(student.id)
+        if index is None:
+            index = self.student_indices[student.id] = len(self.students)
+            self.students.append(student)
+            self.weighted_points.append(0.0)
+            self.total_hours.append(0.0)
+        return index
+
+    # Adding a course also adds the grades it already contains (the students are created from their ids if needed)
+    def add_course(self, course: Course) -> int:
+        index = self.course_indices.get(course.id)
+        if index is None:
+            index = self.course_indices[course.id] = len(self.courses)
+            self.courses.append(course)
+            self.course_hours.append(course.hours)
+            for student_id, grade in list(course.grades.items()):
+                student_index = self.student_indices.get(student_id)
+                student = Student(student_id, "") if student_index is None else self.students[student_index]
+                self.add_grade(student, course, grade)
+        return index
+
+    def add_grade(self, student: Student, course: Course, grade: str):
+        student_index = self.add_student(student)
+        course_index = self.add_course(course)
+        course.add_grade(student, grade)
+        code = GRADE_CODES.get(grade, OTHER_GRADE_CODE)
+        hours = self.course_hours[course_index]
+        row = self.rows.get((student_index, course_index))
+        if row is None:
+            self.rows[student_index, course_index] = len(self.grade_codes)
+            self.grade_students.append(student_index)
+            self.grade_courses.append(course_index)
+            self.grade_codes.append(code)
+            self.total_hours[student_index] += hours
+        else:
+            # A new grade replaces the old one
+            self.weighted_points[student_index] -= hours * POINTS_BY_CODE[self.grade_codes[row]]
+            self.grade_codes[row] = code
+        self.weighted_points[student_index] += hours * POINTS_BY_CODE[code]
+
+    # The GPA of a student from the running sums (0 if the student has no grades)
+    def gpa(self, student: Student) -> float:
+        index = self.student_indices.get(student.id)
+        if index is None or self.total_hours[index] == 0:
+            return 0
+        return self.weighted_points[index] / self.total_hours[index]
+
+    def all_gpas(self) -> Dict[str, float]:
+        '''
+        Recomputes the GPA of every student from the grade arrays in a single vectorized pass
+        and returns a dictionary from the student id to the GPA
+        '''
+        count = len(self.students)
+        if np is not None and len(self.grade_codes) > 0:
+            students = np.frombuffer(self.grade_students, dtype=np.int64)
+            hours = np.frombuffer(self.course_hours, dtype=np.float64)[np.frombuffer(self.grade_courses, dtype=np.int64)]
+            points = np.frombuffer(POINTS_BY_CODE, dtype=np.float64)[np.frombuffer(self.grade_codes, dtype=np.int8)]
+            weighted_points = np.bincount(students, weights=hours * points, minlength=count)
+            total_hours = np.bincount(students, weights=hours, minlength=count)
+            gpas = np.divide(weighted_points, total_hours, out=np.zeros(count), where=total_hours != 0).tolist()
+        else:
+            weighted_points = [0.0] * count
+            total_hours = [0.0] * count
+            course_hours = self.course_hours
+            for student, course, code in zip(self.grade_students, self.grade_courses, self.grade_codes):
+                hours = course_hours[course]
+                weighted_points[student] += hours * POINTS_BY_CODE[code]
+                total_hours[student] += hours
+            gpas = [points / hours if hours else 0 for points, hours in zip(weighted_points, total_hours)]
+        return {student.id: gpa for student, gpa in zip(self.students, gpas)}
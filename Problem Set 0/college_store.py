@@ -0,0 +1,146 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import csv, json, sqlite3
+from college import Student, Course
+
+'''
+    A persistent store for students, courses and grades on top of sqlite3.
+    The grades table has an index on student_id (through its primary key) and another one on course_id,
+    so the transcript of a student or the grades of a course are found without scanning every grade.
+    The grade points are stored in a table too, so the GPA, ranking and "top N" queries are computed by SQL.
+    The GPA follows "gpa_calculator.calculate_gpa": sum(hours * points) / sum(hours) over the courses
+    in which the student has a grade, where unknown grades are worth 0 points and a student without grades has a GPA of 0.
+'''
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (id TEXT PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS courses (id TEXT PRIMARY KEY, name TEXT NOT NULL, hours INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS grades (
+    student_id TEXT NOT NULL,
+    course_id TEXT NOT NULL,
+    grade TEXT NOT NULL,
+    PRIMARY KEY (student_id, course_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS grades_by_course ON grades (course_id);
+CREATE TABLE IF NOT EXISTS grade_points (grade TEXT PRIMARY KEY, points REAL NOT NULL);
+"""
+
+# The weighted points and hours of each student with at least one grade
+GPA_TERMS = """
+SELECT g.student_id AS student_id,
+       SUM(c.hours * COALESCE(p.points, 0)) AS weighted_points,
+       SUM(c.hours) AS hours
+FROM grades g
+JOIN courses c ON c.id = g.course_id
+LEFT JOIN grade_points p ON p.grade = g.grade
+"""
+
+# The GPA of every student (including the ones without grades)
+ALL_GPAS = f"""
+SELECT s.id AS student_id, CASE WHEN t.hours > 0 THEN t.weighted_points / t.hours ELSE 0 END AS gpa
+FROM students s
+LEFT JOIN ({GPA_TERMS} GROUP BY g.student_id) t ON t.student_id = s.id
+"""
+
+# The students' grades as (student id, course id, grade) rows
+GradeRow = Tuple[str, str, str]
+
+class CollegeStore:
+    def __init__(self, path: str = ":memory:") -> None:
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            self.connection.executemany("INSERT OR REPLACE INTO grade_points VALUES (?, ?)", Course.GRADE_POINTS.items())
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> 'CollegeStore':
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    # The insert functions replace the existing rows with the same keys (like Course.add_grade does)
+    def add_students(self, students: Iterable[Tuple[str, str]]):
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO students VALUES (?, ?)", students)
+
+    def add_courses(self, courses: Iterable[Tuple[str, str, int]]):
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO courses VALUES (?, ?, ?)", courses)
+
+    def add_grades(self, grades: Iterable[GradeRow]):
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO grades VALUES (?, ?, ?)", grades)
+
+    # Saves in-memory objects (the grades of the courses are saved too)
+    def save(self, students: Iterable[Student] = (), courses: Iterable[Course] = ()):
+        courses = list(courses)
+        self.add_students((student.id, student.name) for student in students)
+        self.add_courses((course.id, course.name, course.hours) for course in courses)
+        self.add_grades((student_id, course.id, grade) for course in courses for student_id, grade in course.grades.items())
+
+    def import_csv(self, students_path: Optional[str] = None, courses_path: Optional[str] = None, grades_path: Optional[str] = None):
+        '''
+            Imports CSV files with a header row. The expected columns are:
+            - students: id, name
+            - courses: id, name, hours
+            - grades: student_id, course_id, grade
+            The rows are streamed to executemany, so the files are never fully loaded in memory.
+        '''
+        for path, columns, insert in [
+            (students_path, ("id", "name"), self.add_students),
+            (courses_path, ("id", "name", "hours"), self.add_courses),
+            (grades_path, ("student_id", "course_id", "grade"), self.add_grades),
+        ]:
+            if path is None: continue
+            with open(path, 'r', newline='') as f:
+                insert(tuple(row[column] for column in columns) for row in csv.DictReader(f))
+
+    def import_json(self, path: str):
+        '''
+            Imports a JSON file in the form:
+            {"students": [{"id": ..., "name": ...}], "courses": [{"id": ..., "name": ..., "hours": ..., "grades": {student id: grade}}]}
+        '''
+        with open(path, 'r') as f:
+            data = json.load(f)
+        courses = data.get("courses", [])
+        self.add_students((student["id"], student["name"]) for student in data.get("students", []))
+        self.add_courses((course["id"], course["name"], course["hours"]) for course in courses)
+        self.add_grades((student_id, course["id"], grade) for course in courses for student_id, grade in course.get("grades", {}).items())
+
+    def transcript(self, student_id: str) -> List[Tuple[str, str, int, str]]:
+        '''
+            Returns the (course id, course name, hours, grade) of every course in which the student has a grade.
+        '''
+        return self.connection.execute(
+            "SELECT c.id, c.name, c.hours, g.grade FROM grades g JOIN courses c ON c.id = g.course_id WHERE g.student_id = ?",
+            (student_id,)).fetchall()
+
+    # An adapter for "calculate_gpa(student, courses)": the courses of the student's transcript
+    # as Course objects that only contain the grade of this student
+    def courses_of(self, student: Student) -> List[Course]:
+        return [Course(course_id, name, hours, {student.id: grade}) for course_id, name, hours, grade in self.transcript(student.id)]
+
+    def student(self, student_id: str) -> Optional[Student]:
+        row = self.connection.execute("SELECT id, name FROM students WHERE id = ?", (student_id,)).fetchone()
+        return None if row is None else Student(*row)
+
+    def gpa(self, student_id: str) -> float:
+        row = self.connection.execute(f"{GPA_TERMS} WHERE g.student_id = ?", (student_id,)).fetchone()
+        _, weighted_points, hours = row
+        return weighted_points / hours if hours else 0
+
+    def gpas(self) -> Dict[str, float]:
+        return dict(self.connection.execute(ALL_GPAS))
+
+    def ranking(self) -> List[Tuple[str, float, int]]:
+        '''
+            Returns (student id, GPA, rank) for every student from the highest GPA to the lowest.
+            Students with equal GPAs share the same rank (ties are ordered by id).
+        '''
+        return self.connection.execute(
+            f"SELECT student_id, gpa, RANK() OVER (ORDER BY gpa DESC) FROM ({ALL_GPAS}) ORDER BY gpa DESC, student_id").fetchall()
+
+    def top(self, n: int) -> List[Tuple[str, float]]:
+        return self.connection.execute(f"SELECT student_id, gpa FROM ({ALL_GPAS}) ORDER BY gpa DESC, student_id LIMIT ?", (n,)).fetchall()
@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+from grid import Grid, FlatGrid
+import utils
+
+# A value that is never equal to a cell (used when no background value is given)
+NO_BACKGROUND = object()
+
+# A bounding box is (min x, min y, max x, max y) (all inclusive)
+BoundingBox = Tuple[int, int, int, int]
+
+@dataclass
+class Components:
+    labels:         FlatGrid                # The label of each cell (from 1 to count, 0 for the background)
+    count:          int
+    sizes:          Dict[int, int]          # The number of cells of each label
+    bounding_boxes: Dict[int, BoundingBox]  # The bounding box of each label
+
+def find(parents: List[int], label: int) -> int:
+    root = label
+    while parents[root] != root:
+        root = parents[root]
+    # Path compression: make every label on the path point directly to the root
+    while parents[label] != root:
+        parents[label], label = root, parents[label]
+    return root
+
+def union(parents: List[int], first: int, second: int) -> int:
+    first, second = find(parents, first), find(parents, second)
+    if first == second:
+        return first
+    # The smaller label becomes the root so the final labels follow the row-major order
+    if second < first:
+        first, second = second, first
+    parents[second] = first
+    return first
+
+def label_components(grid: Grid, connectivity: int = 4, background: Any = NO_BACKGROUND) -> Components:
+    '''
+    This function finds the connected regions of equal cells in the grid
+    Two cells are connected if they are equal and adjacent (connectivity 4: left/right/up/down, 8: diagonals too)
+    Cells that are equal to the background value get the label 0 and do not belong to any component
+    It makes two passes over the rows (no recursion, so it works for regions of any size):
+    1. Each cell gets the label of an equal neighbor that was already visited (left and above) or a new label.
+       When equal neighbors have different labels, the labels are merged using union-find.
+    2. Each label is replaced by its root, renumbered from 1 in row-major order, and the sizes and bounding boxes are computed.
+    '''
+    if connectivity not in (4, 8):
+        raise ValueError(f"The connectivity must be 4 or 8, got {connectivity}")
+    rows = list(grid.rows())
+    parents = [0] # The label 0 is the background
+    labels: List[List[int]] = []
+    previous_row: List[Any] = []
+    previous_labels: List[int] = []
+    for row in rows:
+        row_labels = [0] * len(row)
+        for x, cell in enumerate(row):
+            if cell == background:
+                continue
+            label = 0
+            neighbors = [(x - 1, row, row_labels)] if x > 0 else []
+            if previous_row:
+                neighbors.append((x, previous_row, previous_labels))
+                if connectivity == 8:
+                    if x > 0: neighbors.append((x - 1, previous_row, previous_labels))
+                    if x + 1 < len(previous_row): neighbors.append((x + 1, previous_row, previous_labels))
+            for neighbor_x, neighbor_row, neighbor_labels in neighbors:
+                neighbor_label = neighbor_labels[neighbor_x]
+                if neighbor_label and neighbor_row[neighbor_x] == cell:
+                    label = neighbor_label if label == 0 else union(parents, label, neighbor_label)
+            if label == 0:
+                label = len(parents)
+                parents.append(label)
+            row_labels[x] = label
+        labels.append(row_labels)
+        previous_row, previous_labels = row, row_labels
+
+    # Renumber the roots in the order in which they were created (which is row-major order)
+    final_labels = [0] * len(parents)
+    count = 0
+    for label in range(1, len(parents)):
+        root = find(parents, label)
+        if root == label:
+            count += 1
+            final_labels[label] = count
+        else:
+            final_labels[label] = final_labels[root]
+
+    sizes: Dict[int, int] = {}
+    bounding_boxes: Dict[int, BoundingBox] = {}
+    for y, row_labels in enumerate(labels):
+        for x, label in enumerate(row_labels):
+            if label == 0: continue
+            label = row_labels[x] = final_labels[label]
+            sizes[label] = sizes.get(label, 0) + 1
+            box = bounding_boxes.get(label)
+            if box is None:
+                bounding_boxes[label] = (x, y, x, y)
+            else:
+                min_x, min_y, max_x, max_y = box
+                if x < min_x or x > max_x or y > max_y:
+                    bounding_boxes[label] = (min(min_x, x), min_y, max(max_x, x), max(max_y, y))
+    return Components(FlatGrid.GridFromArray(labels, indexed=False), count, sizes, bounding_boxes)
@@ -0,0 +1,202 @@
+from array import array
+from typing import Collection, Dict, FrozenSet, Iterable, Iterator, Optional, Sequence, Tuple, Union
+import mmap, os, struct
+
+'''
+    A dictionary index is a word list compiled once into a binary file that can be memory-mapped.
+    The file layout is:
+    - A header: the magic bytes, the number of words and the modification time and size of the word list it was compiled from.
+    - The offsets of the words ("count + 1" unsigned 32-bit integers in the byte order of the machine that compiled it).
+    - The words themselves (lowercase, stripped, sorted and without duplicates), concatenated.
+    Since the words are sorted, membership can be tested directly on the mapped file with a binary search.
+    For heavy scoring, "word_set" and "byte_set" build a hash set once per process and keep it with the index.
+    Loaded indices are cached per process keyed by the path and modification time of the word list,
+    so repeated decipher calls never read, normalize or hash the word list again.
+    The decipher functions also accept the path of a word list or a "WordList" (the immutable sequence that "read_word_list" returns),
+    which are both routed to the index of their file, so the callers that pass them share the same set.
+'''
+
+MAGIC = b"DIDX0001"
+HEADER = struct.Struct("<8sIqq") # magic, word count, source mtime (ns), source size
+INDEX_EXTENSION = ".idx"
+
+class DictionaryIndex:
+    def __init__(self, source_path: str, index_path: str) -> None:
+        self.source_path = source_path
+        self.index_path = index_path
+        with open(index_path, 'rb') as file:
+            self.__buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        _, self.__count, _, _ = HEADER.unpack_from(self.__buffer)
+        offsets_end = HEADER.size + 4 * (self.__count + 1)
+        self.__offsets = memoryview(self.__buffer)[HEADER.size:offsets_end].cast('I')
+        self.__words_start = offsets_end
+        self.__word_set: Optional[FrozenSet[str]] = None
+        self.__byte_set: Optional[FrozenSet[bytes]] = None
+
+    def __len__(self) -> int:
+        return self.__count
+
+    # Returns the index-th word (in sorted order) as bytes
+    def word_bytes(self, index: int) -> bytes:
+        start = self.__words_start + self.__offsets[index]
+        end = self.__words_start + self.__offsets[index+1]
+        return self.__buffer[start:end]
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.word_bytes(index).decode() for index in range(self.__count))
+
+    # Binary search over the mapped file (no set has to be built for a few lookups)
+    def __contains__(self, word: str) -> bool:
+        target = word.encode() if isinstance(word, str) else word
+        low, high = 0, self.__count
+        while low < high:
+            middle = (low + high) // 2
+            if self.word_bytes(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        return low < self.__count and self.word_bytes(low) == target
+
+    # The words as a set of strings, built once for the lifetime of the index
+    def word_set(self) -> FrozenSet[str]:
+        if self.__word_set is None:
+            self.__word_set = frozenset(self)
+        return self.__word_set
+
+    # The words as a set of bytes, built once for the lifetime of the index
+    def byte_set(self) -> FrozenSet[bytes]:
+        if self.__byte_set is None:
+            self.__byte_set = frozenset(self.word_bytes(index) for index in range(self.__count))
+        return self.__byte_set
+
+    # When an index is sent to another process, only the path is sent
+    # and the receiving process loads it from its own cache (mapping the same file)
+    def __reduce__(self):
+        return (load_dictionary_index, (self.source_path, self.index_path))
+
+# The compiled index is stored next to the word list with the extension ".idx"
+def default_index_path(source_path: str) -> str:
+    return os.path.splitext(source_path)[0] + INDEX_EXTENSION
+
+# Checks if the index file exists and was compiled from the current version of the word list
+def is_index_fresh(index_path: str, source_stat: os.stat_result) -> bool:
+    try:
+        with open(index_path, 'rb') as file:
+            magic, _, mtime, size = HEADER.unpack(file.read(HEADER.size))
+    except (OSError, struct.error):
+        return False
+    return magic == MAGIC and mtime == source_stat.st_mtime_ns and size == source_stat.st_size
+
+def compile_dictionary(source_path: str, index_path: Optional[str] = None) -> str:
+    '''
+        This function compiles the word list at "source_path" (one word per line) into an index file
+        and returns the path of the index file.
+        The words are normalized like "helpers.test_tools.read_word_list" does (lowercase and stripped).
+    '''
+    index_path = index_path or default_index_path(source_path)
+    source_stat = os.stat(source_path)
+    with open(source_path, 'r') as file:
+        words = sorted({line.lower().strip().encode() for line in file})
+    offsets = array('I', [0])
+    for word in words:
+        offsets.append(offsets[-1] + len(word))
+    # Write to a temporary file then rename it so that other processes never map a half-written index
+    temporary_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(temporary_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, len(words), source_stat.st_mtime_ns, source_stat.st_size))
+        file.write(offsets.tobytes())
+        file.write(b"".join(words))
+    os.replace(temporary_path, index_path)
+    return index_path
+
+# The indices loaded by this process keyed by (absolute source path, source mtime)
+_index_cache: Dict[Tuple[str, int], DictionaryIndex] = {}
+
+def load_dictionary_index(source_path: str, index_path: Optional[str] = None) -> DictionaryIndex:
+    '''
+        This function returns the index of the word list at "source_path".
+        The index is compiled if it does not exist or if the word list changed since it was compiled.
+        Within a process, the same index object is returned as long as the word list does not change.
+    '''
+    source_path = os.path.abspath(source_path)
+    source_stat = os.stat(source_path)
+    key = (source_path, source_stat.st_mtime_ns)
+    index = _index_cache.get(key)
+    if index is None:
+        index_path = index_path or default_index_path(source_path)
+        if not is_index_fresh(index_path, source_stat):
+            compile_dictionary(source_path, index_path)
+        index = DictionaryIndex(source_path, index_path)
+        for stale_key in [stale_key for stale_key in _index_cache if stale_key[0] == source_path]:
+            del _index_cache[stale_key]
+        _index_cache[key] = index
+    return index
+
+def clear_dictionary_cache():
+    _index_cache.clear()
+
+class WordList(Sequence[str]):
+    '''
+        The words of a word list file (normalized like the index) that remembers the path and modification time of the file,
+        so "as_word_set" and "as_byte_set" return the sets of the file's index instead of hashing the words again.
+        It is immutable so it always matches the file it was read from (unless the file itself changes);
+        to change the words, copy them into a list (which is then treated like any other list).
+    '''
+    def __init__(self, words: Iterable[str], source_path: Optional[str] = None, source_mtime: Optional[int] = None) -> None:
+        self.__words = tuple(words)
+        self.source_path = source_path
+        self.source_mtime = source_mtime
+
+    @staticmethod
+    def from_file(source_path: str) -> 'WordList':
+        with open(source_path, 'r') as file:
+            words = [line.lower().strip() for line in file.readlines()]
+        return WordList(words, os.path.abspath(source_path), os.stat(source_path).st_mtime_ns)
+
+    def __len__(self) -> int:
+        return len(self.__words)
+
+    def __getitem__(self, index):
+        return self.__words[index]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__words)
+
+    def __repr__(self) -> str:
+        return f"WordList({len(self.__words)} words from {self.source_path!r})"
+
+    # Returns the index of the file if the file did not change since it was read
+    def source_index(self) -> Optional[DictionaryIndex]:
+        if self.source_path is None: return None
+        try:
+            if os.stat(self.source_path).st_mtime_ns != self.source_mtime: return None
+        except OSError:
+            return None
+        return load_dictionary_index(self.source_path)
+
+# Returns the index that a dictionary (an index, a path to a word list or an unchanged WordList) is routed to
+def dictionary_index_of(dictionary: Union[Collection[str], str]) -> Optional[DictionaryIndex]:
+    if isinstance(dictionary, DictionaryIndex):
+        return dictionary
+    if isinstance(dictionary, str):
+        return load_dictionary_index(dictionary)
+    if isinstance(dictionary, WordList):
+        return dictionary.source_index()
+    return None
+
+# Returns a set of the dictionary words without rebuilding it if the dictionary is already a set
+# or is routed to an index (see "dictionary_index_of"), any other collection (e.g. a plain list) is hashed on every call
+def as_word_set(dictionary: Union[Collection[str], str]) -> Collection[str]:
+    index = dictionary_index_of(dictionary)
+    if index is not None:
+        return index.word_set()
+    if isinstance(dictionary, (set, frozenset)):
+        return dictionary
+    return set(dictionary)
+
+# Same as "as_word_set" but the words are encoded as bytes
+def as_byte_set(dictionary: Union[Collection[str], str]) -> Collection[bytes]:
+    index = dictionary_index_of(dictionary)
+    if index is not None:
+        return index.byte_set()
+    return {word.encode() for word in dictionary}
@@ -1,4 +1,12 @@
-from typing import Any, List, Tuple
+from array import array
+from itertools import accumulate, repeat
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+import operator
+
+try:
+    import numpy as np
+except ImportError: # The summed-area tables are built in pure python if numpy is not installed
+    np = None
 
 
 class Grid:
@@ -8,6 +16,7 @@ class Grid:
 
     def __init__(self, width: int, height: int) -> None:
         self.__data = [[None]*width for _ in range(height)]
+        self.__summed_areas: Dict[Any, SummedAreaTable] = {}
     
     @property
     def width(self) -> int:
@@ -32,20 +41,337 @@ class Grid:
         if 0 <= y < len(self.__data):
             row = self.__data[y]
             if 0 <= x < len(row):
+                if self.__summed_areas:
+                    patch_summed_areas(self.__summed_areas, x, y, row[x], value)
                 row[x] = value
     
+    # Returns the number of cells that are equal to the value in the rectangle [x0, x1) x [y0, y1) in O(1)
+    # The summed-area table of each value is built on its first query (the value must be hashable)
+    def count(self, value: Any, x0: int, y0: int, x1: int, y1: int) -> int:
+        table = self.__summed_areas.get(value)
+        if table is None:
+            table = self.__summed_areas[value] = SummedAreaTable(self.rows(), value, self.width, self.height)
+        elif len(table.pending) > table.max_pending:
+            table.build(self.rows())
+        return table.count(x0, y0, x1, y1)
+
+    # Drops the summed-area tables (they are rebuilt on the next query)
+    def clear_summed_areas(self):
+        self.__summed_areas.clear()
+
+    # Returns the rows of the grid from top (y = 0) to bottom
+    # The rows must not be modified (use __setitem__ instead)
+    def rows(self) -> Iterator[List[Any]]:
+        return iter(self.__data)
+
     # This function is called whenever we convert the grid into a string
     # This is useful for printing
     def __str__(self) -> str:
         return '\n'.join(' '.join(str(cell) for cell in row) for row in self.__data)
     
     # This static method creates a grid from a list of lists
+    # The storage is one of STORAGES: "dense" creates a Grid, "sparse" creates a SparseGrid,
+    # and "auto" creates a SparseGrid only when less than SPARSE_DENSITY of the cells are filled (not None)
     @staticmethod
-    def GridFromArray(array: List[List[Any]]) -> 'Grid':
+    def GridFromArray(array: List[List[Any]], storage: str = "dense") -> Union['Grid', 'SparseGrid']:
+        if storage not in STORAGES:
+            raise ValueError(f"The storage must be one of {', '.join(STORAGES)}, got {storage!r}")
         height = len(array)
         width = 0 if height == 0 else max(len(row) for row in array)
+        if storage == "auto":
+            filled = sum(1 for row in array for cell in row if cell is not None)
+            storage = "sparse" if width * height > 0 and filled < SPARSE_DENSITY * width * height else "dense"
+        if storage == "sparse":
+            return SparseGrid.GridFromArray(array)
         grid = Grid(width, height)
         for y, row in enumerate(array):
             for x, cell in enumerate(row):
                 grid[x, y] = cell
-        return grid
\ No newline at end of file
+        return grid
+
+
+# A grid with the same API as "Grid" but whose cells are stored in a single flat list (row by row)
+# It can also keep an inverted index from each value to the set of its positions (except for None, the empty cells)
+# which is updated by __setitem__, so the positions of a value are found in O(number of matches).
+# The index requires hashable values; if an unhashable value is stored, the index is dropped.
+class FlatGrid:
+    __slots__ = ("__width", "__height", "__cells", "__index", "__summed_areas")
+
+    def __init__(self, width: int, height: int, indexed: bool = True) -> None:
+        self.__width = width if height > 0 else 0
+        self.__height = height
+        self.__cells: List[Any] = [None] * (self.__width * height)
+        self.__index: Optional[Dict[Any, Set[Tuple[int, int]]]] = {} if indexed else None
+        self.__summed_areas: Dict[Any, SummedAreaTable] = {}
+
+    @property
+    def width(self) -> int:
+        return self.__width
+
+    @property
+    def height(self) -> int:
+        return self.__height
+
+    @property
+    def indexed(self) -> bool:
+        return self.__index is not None
+
+    # The key used to access the grid is a tuple of two integers (x, y)
+    def __getitem__(self, key: Tuple[int, int]) -> Any:
+        x, y = key
+        if 0 <= x < self.__width and 0 <= y < self.__height:
+            return self.__cells[y * self.__width + x]
+        return None
+
+    # The key used to access the grid is a tuple of two integers (x, y)
+    def __setitem__(self, key, value) -> None:
+        x, y = key
+        if 0 <= x < self.__width and 0 <= y < self.__height:
+            offset = y * self.__width + x
+            index = self.__index
+            if index is not None:
+                old_value = self.__cells[offset]
+                try:
+                    if value is not None:
+                        index.setdefault(value, set()).add((x, y))
+                    if old_value is not None and old_value != value:
+                        positions = index[old_value]
+                        positions.discard((x, y))
+                        if not positions: del index[old_value]
+                except TypeError: # Unhashable value
+                    self.__index = None
+            if self.__summed_areas:
+                patch_summed_areas(self.__summed_areas, x, y, self.__cells[offset], value)
+            self.__cells[offset] = value
+
+    # Returns the number of cells that are equal to the value in the rectangle [x0, x1) x [y0, y1) in O(1)
+    # The summed-area table of each value is built on its first query (the value must be hashable)
+    def count(self, value: Any, x0: int, y0: int, x1: int, y1: int) -> int:
+        table = self.__summed_areas.get(value)
+        if table is None:
+            table = self.__summed_areas[value] = SummedAreaTable(self.rows(), value, self.__width, self.__height)
+        elif len(table.pending) > table.max_pending:
+            table.build(self.rows())
+        return table.count(x0, y0, x1, y1)
+
+    # Drops the summed-area tables (they are rebuilt on the next query)
+    def clear_summed_areas(self):
+        self.__summed_areas.clear()
+
+    # Returns the set of the positions that contain the item
+    def positions(self, item: Any) -> Set[Tuple[int, int]]:
+        if self.__index is not None and item is not None:
+            try:
+                return set(self.__index.get(item, ()))
+            except TypeError: # An unhashable item cannot be in the index
+                return set()
+        width = self.__width or 1
+        return {(offset % width, offset // width) for offset, cell in enumerate(self.__cells) if cell == item}
+
+    # Returns the rows of the grid from top (y = 0) to bottom as new lists
+    def rows(self) -> Iterator[List[Any]]:
+        cells, width = self.__cells, self.__width
+        return (cells[y*width:(y+1)*width] for y in range(self.__height))
+
+    # This function is called whenever we convert the grid into a string
+    # This is useful for printing
+    def __str__(self) -> str:
+        return '\n'.join(' '.join(str(cell) for cell in row) for row in self.rows())
+
+    # This static method creates a grid from a list of lists (shorter rows are padded with None)
+    @staticmethod
+    def GridFromArray(array: List[List[Any]], indexed: bool = True) -> 'FlatGrid':
+        height = len(array)
+        width = 0 if height == 0 else max(len(row) for row in array)
+        grid = FlatGrid(width, height, indexed=False)
+        grid.__cells = [cell for row in array for cell in (list(row) + [None] * (width - len(row)))]
+        if indexed:
+            grid.__index = {}
+            try:
+                for offset, cell in enumerate(grid.__cells):
+                    if cell is not None:
+                        grid.__index.setdefault(cell, set()).add((offset % width, offset // width))
+            except TypeError: # Unhashable value
+                grid.__index = None
+        return grid
+
+
+# The storages of "Grid.GridFromArray"
+STORAGES = ("dense", "sparse", "auto")
+
+# Grids where less than this fraction of the cells are filled are created as sparse grids by "Grid.GridFromArray(array, storage="auto")"
+SPARSE_DENSITY = 0.1
+
+# A grid with the same API as "Grid" for mostly empty worlds
+# Only the filled cells (that are not None) are stored in a dictionary from (x, y) to the value,
+# and the x coordinates of the filled cells of each row are kept in a set (the row occupancy),
+# so the memory and the time to find or count values depend on the number of filled cells instead of width x height.
+class SparseGrid:
+    __slots__ = ("__width", "__height", "__cells", "__rows")
+
+    def __init__(self, width: int, height: int) -> None:
+        self.__width = width if height > 0 else 0
+        self.__height = height
+        self.__cells: Dict[Tuple[int, int], Any] = {}
+        self.__rows: Dict[int, Set[int]] = {}
+
+    @property
+    def width(self) -> int:
+        return self.__width
+
+    @property
+    def height(self) -> int:
+        return self.__height
+
+    # The number of filled cells
+    @property
+    def filled(self) -> int:
+        return len(self.__cells)
+
+    # The key used to access the grid is a tuple of two integers (x, y)
+    def __getitem__(self, key: Tuple[int, int]) -> Any:
+        x, y = key
+        return self.__cells.get((x, y))
+
+    # The key used to access the grid is a tuple of two integers (x, y)
+    # Setting a cell to None empties it
+    def __setitem__(self, key, value) -> None:
+        x, y = key
+        if 0 <= x < self.__width and 0 <= y < self.__height:
+            if value is None:
+                if self.__cells.pop((x, y), None) is not None:
+                    row = self.__rows[y]
+                    row.discard(x)
+                    if not row: del self.__rows[y]
+            else:
+                self.__cells[x, y] = value
+                self.__rows.setdefault(y, set()).add(x)
+
+    # Returns the filled cells as ((x, y), value) pairs
+    def occupied(self) -> Iterator[Tuple[Tuple[int, int], Any]]:
+        return iter(self.__cells.items())
+
+    # Returns the set of the positions that contain the item (only the filled cells are visited unless the item is None)
+    # The positions of None are the empty cells, so finding them takes O(width x height) like in "Grid"
+    def positions(self, item: Any) -> Set[Tuple[int, int]]:
+        if item is None:
+            cells = self.__cells
+            return {(x, y) for y in range(self.__height) for x in range(self.__width) if (x, y) not in cells}
+        return {position for position, cell in self.__cells.items() if cell == item}
+
+    # Returns the number of cells that are equal to the value in the rectangle [x0, x1) x [y0, y1)
+    # Only the filled cells of the rows in the rectangle are visited
+    def count(self, value: Any, x0: int, y0: int, x1: int, y1: int) -> int:
+        x0, x1 = max(0, x0), min(self.__width, x1)
+        y0, y1 = max(0, y0), min(self.__height, y1)
+        if x0 >= x1 or y0 >= y1:
+            return 0
+        cells = self.__cells
+        if value is None:
+            filled = sum(1 for y, xs in self.__rows.items() if y0 <= y < y1 for x in xs if x0 <= x < x1)
+            return (x1 - x0) * (y1 - y0) - filled
+        return sum(1 for y, xs in self.__rows.items() if y0 <= y < y1 for x in xs if x0 <= x < x1 and cells[x, y] == value)
+
+    # The counts are computed from the filled cells, so there are no summed-area tables to drop (kept for the API of "Grid")
+    def clear_summed_areas(self):
+        pass
+
+    # Returns the rows of the grid from top (y = 0) to bottom as new lists
+    def rows(self) -> Iterator[List[Any]]:
+        for y in range(self.__height):
+            row = [None] * self.__width
+            for x in self.__rows.get(y, ()):
+                row[x] = self.__cells[x, y]
+            yield row
+
+    # This function is called whenever we convert the grid into a string
+    # This is useful for printing
+    def __str__(self) -> str:
+        return '\n'.join(' '.join(str(cell) for cell in row) for row in self.rows())
+
+    # This static method creates a grid from a list of lists
+    @staticmethod
+    def GridFromArray(array: List[List[Any]]) -> 'SparseGrid':
+        height = len(array)
+        width = 0 if height == 0 else max(len(row) for row in array)
+        grid = SparseGrid(width, height)
+        for y, row in enumerate(array):
+            for x, cell in enumerate(row):
+                if cell is not None:
+                    grid[x, y] = cell
+        return grid
+
+# A summed-area table (2D prefix sums) of the cells that are equal to a value
+# The entry (x, y) is the number of matching cells in the rectangle [0, x) x [0, y), so any rectangle is counted with 4 lookups.
+# Changes to the grid are recorded as pending (x, y, +1/-1) patches that are added to the counts,
+# and the table is rebuilt once there are more than "max_pending" of them.
+# The counts are 32-bit integers (unless the grid has 2^31 cells or more), stored in a flat array of (height + 1) x (width + 1) entries
+# which is a numpy array if it was built by numpy (only for grids of numbers) or a python array otherwise.
+class SummedAreaTable:
+    def __init__(self, rows: Iterable[List[Any]], value: Any, width: int, height: int, max_pending: int = 256) -> None:
+        self.value = value
+        self.width = width
+        self.height = height
+        self.max_pending = max_pending
+        self.pending: Dict[Tuple[int, int], int] = {}
+        self.build(rows)
+
+    def build(self, rows: Iterable[List[Any]]):
+        stride = self.width + 1
+        typecode = 'i' if self.width * self.height < 2**31 else 'q'
+        rows = list(rows)
+        matches = self.numeric_matches(rows)
+        if matches is not None:
+            table = np.zeros((self.height + 1, stride), dtype=np.intc if typecode == 'i' else np.int64)
+            np.cumsum(matches.cumsum(axis=0, dtype=table.dtype), axis=1, out=table[1:, 1:])
+            self.table = table.reshape(-1)
+        else:
+            self.table = table = array(typecode, bytes(array(typecode).itemsize * stride * (self.height + 1)))
+            for y, row in enumerate(rows):
+                above = table[y*stride+1:(y+1)*stride]
+                row_sums = accumulate(map(operator.eq, row, repeat(self.value)))
+                table[(y+1)*stride+1:(y+2)*stride] = array(typecode, map(operator.add, above, row_sums))
+        self.pending.clear()
+
+    # Returns the boolean numpy array of the cells that are equal to the value,
+    # or None if numpy is not installed or the cells do not form a 2D array of numbers (e.g. sequences or strings)
+    def numeric_matches(self, rows: List[List[Any]]):
+        if np is None or self.width == 0 or not isinstance(self.value, (int, float)):
+            return None
+        try:
+            cells = np.array(rows)
+        except (ValueError, TypeError): # Ragged sequence cells cannot form an array
+            return None
+        if cells.shape != (self.height, self.width) or cells.dtype.kind not in "biuf":
+            return None
+        return cells == self.value
+
+    # Records that the cell (x, y) started (+1) or stopped (-1) matching the value
+    def patch(self, x: int, y: int, delta: int):
+        delta += self.pending.pop((x, y), 0)
+        if delta:
+            self.pending[x, y] = delta
+
+    def count(self, x0: int, y0: int, x1: int, y1: int) -> int:
+        x0, x1 = max(0, x0), min(self.width, x1)
+        y0, y1 = max(0, y0), min(self.height, y1)
+        if x0 >= x1 or y0 >= y1:
+            return 0
+        table, stride = self.table, self.width + 1
+        total = int(table[y1*stride+x1]) - int(table[y0*stride+x1]) - int(table[y1*stride+x0]) + int(table[y0*stride+x0])
+        for (x, y), delta in self.pending.items():
+            if x0 <= x < x1 and y0 <= y < y1:
+                total += delta
+        return total
+
+# Updates the summed-area tables of the old and new values of a cell
+def patch_summed_areas(tables: Dict[Any, SummedAreaTable], x: int, y: int, old_value: Any, new_value: Any):
+    if old_value == new_value:
+        return
+    for value, delta in ((old_value, -1), (new_value, +1)):
+        try:
+            table = tables.get(value)
+        except TypeError: # Unhashable values are never counted
+            continue
+        if table is not None:
+            table.patch(x, y, delta)
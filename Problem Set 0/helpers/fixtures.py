@@ -0,0 +1,160 @@
+from typing import Any, Callable, Dict, Iterable, Set, Tuple
+import dataclasses, hashlib, io, os, pickle, re, sys
+
+'''
+    The fixture cache stores the evaluated inputs of the test cases (such as "DungeonProblem.from_file('dungeons/dungeon1.txt')")
+    so that the data files are not parsed again on every run.
+    - On disk: one pickle per testcase file (in the cache directory) that contains the evaluated expressions of the testcase
+      and its dependencies: the testcase file, the data files that the expressions refer to and the local source files
+      of the classes of the values. Each dependency is stored with its modification time, size and hash.
+      A cached pickle is used only if every dependency is unchanged (its hash is only recomputed if its modification time changed).
+    - In memory: the pickled value of each expression, so an object that is shared by several testcases is parsed only once per run.
+    Every test receives a fresh copy (unpickled) of the value, so a test cannot change the inputs of another test.
+    Expressions that load the student's code ("load_function") or contain lambdas are never cached,
+    and values that cannot be pickled are evaluated every time.
+'''
+
+CACHE_DIRECTORY = ".fixture_cache"
+
+# A dependency is stored as (modification time in ns, size, sha256)
+Dependency = Tuple[int, int, str]
+
+QUOTED_STRING = re.compile(r"'([^']*)'|\"([^\"]*)\"")
+
+def is_cacheable(expression: str) -> bool:
+    return "load_function" not in expression and "lambda" not in expression
+
+def file_hash(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def describe_file(path: str) -> Dependency:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size, file_hash(path)
+
+def is_unchanged(path: str, dependency: Dependency) -> bool:
+    mtime, size, digest = dependency
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    if stat.st_size != size: return False
+    return stat.st_mtime_ns == mtime or file_hash(path) == digest
+
+# The data files that an expression refers to (quoted strings that are paths of existing files)
+def referenced_files(expression: str) -> Set[str]:
+    return {path for match in QUOTED_STRING.finditer(expression) for path in match.groups() if path and os.path.isfile(path)}
+
+def restore_frozen_slots(cls: type, state: Dict[str, Any]) -> Any:
+    obj = object.__new__(cls)
+    for name, value in state.items():
+        object.__setattr__(obj, name, value)
+    return obj
+
+class FixturePickler(pickle.Pickler):
+    '''
+        A pickler that records the modules of the pickled objects (to find the source files that the value depends on)
+        and supports frozen dataclasses with __slots__ (such as Point) which the default pickler cannot restore.
+    '''
+    def __init__(self, file: io.BytesIO) -> None:
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.modules: Set[str] = set()
+
+    def reducer_override(self, obj: Any):
+        if isinstance(obj, type):
+            self.modules.add(obj.__module__)
+            return NotImplemented
+        cls = type(obj)
+        self.modules.add(cls.__module__)
+        params = getattr(cls, "__dataclass_params__", None)
+        if params is not None and params.frozen and "__slots__" in cls.__dict__:
+            return restore_frozen_slots, (cls, {field.name: getattr(obj, field.name) for field in dataclasses.fields(obj)})
+        return NotImplemented
+
+# Returns the pickled value and the local source files of the modules of its objects
+def dump_value(value: Any) -> Tuple[bytes, Set[str]]:
+    buffer = io.BytesIO()
+    pickler = FixturePickler(buffer)
+    pickler.dump(value)
+    root = os.getcwd()
+    sources = set()
+    for name in pickler.modules:
+        path = getattr(sys.modules.get(name), "__file__", None)
+        if path and os.path.abspath(path).startswith(root + os.sep):
+            sources.add(os.path.relpath(path, root))
+    return buffer.getvalue(), sources
+
+class FixtureCache:
+    def __init__(self, directory: str = CACHE_DIRECTORY) -> None:
+        self.directory = directory
+        self.memory: Dict[str, Tuple[bytes, Dict[str, Dependency]]] = {}  # The pickled value and the dependencies of each expression
+        self.uncacheable: Set[str] = set()              # The expressions whose values cannot be pickled
+        self.entries: Dict[str, Dict[str, Any]] = {}    # The cache entry of each testcase path
+        self.dirty: Set[str] = set()                    # The testcase paths whose entries must be saved
+        self.hits = 0
+        self.misses = 0
+
+    def cache_path(self, testcase_path: str) -> str:
+        name = hashlib.sha1(os.path.normpath(testcase_path).encode()).hexdigest()
+        return os.path.join(self.directory, f"{name}-py{sys.version_info[0]}{sys.version_info[1]}.pickle")
+
+    # Loads the entry of the testcase from the disk if it is still valid, otherwise it starts an empty entry
+    def entry(self, testcase_path: str) -> Dict[str, Any]:
+        entry = self.entries.get(testcase_path)
+        if entry is not None: return entry
+        entry = None
+        try:
+            with open(self.cache_path(testcase_path), 'rb') as f:
+                entry = pickle.load(f)
+            if not all(is_unchanged(path, dependency) for path, dependency in entry["dependencies"].items()):
+                entry = None
+        except Exception: # No cache or an unreadable one
+            entry = None
+        if entry is None:
+            entry = {"dependencies": {testcase_path: describe_file(testcase_path)}, "values": {}}
+        self.entries[testcase_path] = entry
+        return entry
+
+    def evaluate(self, expression: str, testcase_path: str, evaluate: Callable[[str], Any]) -> Any:
+        '''
+            Returns a fresh copy of the value of the expression (from the memory or the disk cache if possible).
+            "evaluate" computes the value of an expression (it must be defined where the expression's names are visible).
+        '''
+        if not is_cacheable(expression) or expression in self.uncacheable or not os.path.isfile(testcase_path):
+            return evaluate(expression)
+        entry = self.entry(testcase_path)
+        data = entry["values"].get(expression)
+        if data is not None:
+            self.hits += 1
+            return pickle.loads(data)
+        if expression in self.memory:
+            self.hits += 1
+            data, dependencies = self.memory[expression]
+            value = pickle.loads(data)
+        else:
+            self.misses += 1
+            value = evaluate(expression)
+            try:
+                data, sources = dump_value(value)
+                pickle.loads(data)
+            except Exception:
+                self.uncacheable.add(expression)
+                return value
+            dependencies = {path: describe_file(path) for path in referenced_files(expression) | sources}
+            self.memory[expression] = (data, dependencies)
+        entry["values"][expression] = data
+        entry["dependencies"].update(dependencies)
+        self.dirty.add(testcase_path)
+        return value
+
+    # Saves the changed entries (the file is replaced atomically since several worker processes may write it)
+    def save(self, testcase_paths: Iterable[str] = None):
+        for testcase_path in list(self.dirty if testcase_paths is None else testcase_paths):
+            if testcase_path not in self.dirty: continue
+            self.dirty.discard(testcase_path)
+            os.makedirs(self.directory, exist_ok=True)
+            path = self.cache_path(testcase_path)
+            temporary_path = f"{path}.{os.getpid()}.tmp"
+            with open(temporary_path, 'wb') as f:
+                pickle.dump(self.entries[testcase_path], f, pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, path)
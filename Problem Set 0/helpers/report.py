@@ -0,0 +1,114 @@
+from typing import Any, Dict, List
+import json
+import xml.etree.ElementTree as ET
+
+'''
+    The autograder reports store the result and the measurements of every test case in a file that is easy to diff between runs.
+    - json: the tests are listed in the order of the run and the keys are sorted. The measurements change in every run,
+      so they are only written if requested, in a separate "measurements" section (with the times rounded to 0.1 ms),
+      and two runs with the same results give the same "problems" section.
+    - junit: the JUnit XML format that CI tools understand, where the measurements are the properties of each testcase.
+
+    A test record contains:
+    - index, description, status ("pass", "fail" or "not implemented"), grade, maximum_grade, message and time_limit.
+    - call_counts: the explored nodes and the recorded calls fetched by the test tools (by function name).
+    - cached: True if the result was reused from the result cache (in incremental mode), then the measurements are the cached ones.
+    - measurements: the values that change between runs (MEASUREMENT_KEYS):
+      - wall_time and cpu_time (in seconds) of the function and the comparator.
+      - peak_rss (in KB): the peak RSS of the sandbox process that ran the test case (only in the sandbox).
+      - tracemalloc_peak (in KB): the peak memory allocated during the test (only if memory tracing is enabled).
+'''
+
+REPORT_FORMATS = ["json", "junit"]
+DEFAULT_REPORT_PATHS = {"json": "report.json", "junit": "report.xml"}
+MEASUREMENT_KEYS = ["wall_time", "cpu_time", "peak_rss", "tracemalloc_peak"]
+
+# A test record (see above) and a problem record: {"name", "grade", "maximum_grade", "tests"}
+TestRecord = Dict[str, Any]
+ProblemRecord = Dict[str, Any]
+
+def make_test_record(index: int, description: str, status: str, grade: float, maximum_grade: float,
+                     message: str, time_limit: Any, metrics: Dict[str, Any]) -> TestRecord:
+    record = {
+        "index": index,
+        "description": description,
+        "status": status,
+        "grade": grade,
+        "maximum_grade": maximum_grade,
+        "message": message,
+        "time_limit": time_limit,
+        "measurements": {},
+    }
+    for key, value in metrics.items():
+        value = round(value, 4) if isinstance(value, float) else value
+        if key in MEASUREMENT_KEYS:
+            record["measurements"][key] = value
+        else:
+            record[key] = value
+    return record
+
+# The measurements of the tests by problem name and test index
+def collect_measurements(problems: List[ProblemRecord]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    return {problem["name"]: {str(test["index"]): test["measurements"] for test in problem["tests"]} for problem in problems}
+
+def write_json_report(path: str, name: str, problems: List[ProblemRecord], measurements: bool = False):
+    report = {
+        "name": name,
+        "grade": sum(problem["grade"] for problem in problems),
+        "maximum_grade": sum(problem["maximum_grade"] for problem in problems),
+        "problems": [
+            {**problem, "tests": [{key: value for key, value in test.items() if key != "measurements"} for test in problem["tests"]]}
+            for problem in problems
+        ],
+    }
+    if measurements:
+        report["measurements"] = collect_measurements(problems)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def write_junit_report(path: str, name: str, problems: List[ProblemRecord]):
+    def total(tests: List[TestRecord], key: str) -> str:
+        return f"{sum(test['measurements'].get(key, 0) for test in tests):.4f}"
+    all_tests = [test for problem in problems for test in problem["tests"]]
+    suites = ET.Element("testsuites", name=name, tests=str(len(all_tests)),
+                        failures=str(sum(test["status"] == "fail" for test in all_tests)),
+                        skipped=str(sum(test["status"] == "not implemented" for test in all_tests)),
+                        time=total(all_tests, "wall_time"))
+    for problem in problems:
+        tests = problem["tests"]
+        suite = ET.SubElement(suites, "testsuite", name=problem["name"], tests=str(len(tests)),
+                              failures=str(sum(test["status"] == "fail" for test in tests)),
+                              skipped=str(sum(test["status"] == "not implemented" for test in tests)),
+                              time=total(tests, "wall_time"))
+        properties = ET.SubElement(suite, "properties")
+        for key in ("grade", "maximum_grade"):
+            ET.SubElement(properties, "property", name=key, value=str(problem[key]))
+        for test in tests:
+            case = ET.SubElement(suite, "testcase", classname=problem["name"],
+                                 name=f"{test['index']}: {test['description']}", time=f"{test['measurements'].get('wall_time', 0):.4f}")
+            properties = ET.SubElement(case, "properties")
+            for key, value in sorted({**test, **test["measurements"]}.items()):
+                if key in ("index", "description", "status", "message", "measurements"): continue
+                if key == "call_counts":
+                    for function, count in sorted(value.items()):
+                        ET.SubElement(properties, "property", name=f"calls:{function}", value=str(count))
+                else:
+                    ET.SubElement(properties, "property", name=key, value=str(value))
+            if test["status"] == "fail":
+                failure = ET.SubElement(case, "failure", message=test["message"].splitlines()[0] if test["message"] else "")
+                failure.text = test["message"]
+            elif test["status"] == "not implemented":
+                ET.SubElement(case, "skipped", message="Function is not implemented yet")
+    tree = ET.ElementTree(suites)
+    ET.indent(tree)
+    tree.write(path, encoding="utf-8", xml_declaration=True)
+
+# The measurements are always in the junit report (CI tools show the times) but only in the json report if "measurements" is True
+def write_report(report_format: str, path: str, name: str, problems: List[ProblemRecord], measurements: bool = False):
+    if report_format == "json":
+        write_json_report(path, name, problems, measurements)
+    elif report_format == "junit":
+        write_junit_report(path, name, problems)
+    else:
+        raise ValueError(f"Unknown report format {report_format}, expected one of {REPORT_FORMATS}")
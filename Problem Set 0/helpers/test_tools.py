@@ -1,13 +1,15 @@
-from .utils import Result
-from typing import Tuple, List
+from .utils import Result, load_function
+from typing import Any, Callable, Dict, Tuple, List, Hashable, Iterable, Optional, Sequence, Union
+from collections import Counter
+import io, json, os, subprocess, sys, tempfile
 
 def read_text_file(file_path: str) -> str:
     with open(file_path, 'r') as f:
         return f.read()
 
-def read_word_list(file_path: str) -> List[str]:
-    with open(file_path, 'r') as f:
-        return [line.lower().strip() for line in f.readlines()]
+# The word list remembers its file, so the decipher functions share the set of the file's compiled index (see dictionary_index.py)
+def read_word_list(file_path: str) -> Sequence[str]:
+    return load_function('dictionary_index.WordList').from_file(file_path)
 
 def compare_decipher(output: Tuple[str, int, int], expected_file_path: str, expected_shift: int, expected_wrong: int, log_path: str) -> Result:
     if not isinstance(output, tuple):
@@ -34,4 +36,231 @@ def compare_decipher(output: Tuple[str, int, int], expected_file_path: str, expe
     return Result(True, 1, "")
     
 
-    
\ No newline at end of file
+    
+# A binary stream that cannot seek (like a pipe)
+class UnseekableStream(io.RawIOBase):
+    def __init__(self, data: bytes):
+        self.__data = io.BytesIO(data)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        return self.__data.readinto(buffer)
+
+def run_stream_decipher(file_path: str, dictionary: List[str], source_type: str = "path", chunk_size: int = 1 << 20) -> Tuple[str, int, int]:
+    '''
+        Runs "caesar_stream.caesar_dechiper_stream" on the file given as a "path", a "seekable" stream or an "unseekable" stream
+        and returns the deciphered text with the shift and the word count (like "caesar.caesar_dechiper").
+    '''
+    caesar_dechiper_stream = load_function('caesar_stream.caesar_dechiper_stream')
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    source = {"path": file_path, "seekable": io.BytesIO(data), "unseekable": UnseekableStream(data)}[source_type]
+    output = io.BytesIO()
+    shift, wrong = caesar_dechiper_stream(source, dictionary, output, chunk_size=chunk_size)
+    return output.getvalue().decode(), shift, wrong
+
+# Returns whether two lists read from the same word list share one word set (the set of the compiled index)
+def shares_word_set(file_path: str) -> bool:
+    as_word_set = load_function('dictionary_index.as_word_set')
+    return as_word_set(read_word_list(file_path)) is as_word_set(read_word_list(file_path))
+
+# Copies the word list into a list, adds a word to it and returns whether it still shares the set of the index and whether the word is in its set
+def changed_word_list(file_path: str, word: str) -> Tuple[bool, bool]:
+    as_word_set = load_function('dictionary_index.as_word_set')
+    words = list(read_word_list(file_path))
+    words.append(word)
+    word_set = as_word_set(words)
+    return word_set is as_word_set(file_path), word in word_set
+
+# Gets the word set of a list, replaces a word of the list in place and returns whether the new word and the replaced word are in its new word set
+def word_set_after_edit(words: List[str], index: int, word: str) -> Tuple[bool, bool]:
+    as_word_set = load_function('dictionary_index.as_word_set')
+    as_word_set(words)
+    replaced, words[index] = words[index], word
+    word_set = as_word_set(words)
+    return word in word_set, replaced in word_set
+
+# Returns whether an index sent through pickle (e.g. to a worker process) is the same cached index
+def index_survives_pickle(file_path: str) -> bool:
+    import pickle
+    index = load_function('dictionary_index.load_dictionary_index')(file_path)
+    return pickle.loads(pickle.dumps(index)) is index
+
+# Enciphers the text with the Vigenere key then returns the (deciphered text, key) that "cipher_crack.crack_vigenere" finds
+def crack_vigenere_text(text: str, key: str) -> Tuple[str, str]:
+    vigenere_encipher = load_function('cipher_crack.vigenere_encipher')
+    crack_vigenere = load_function('cipher_crack.crack_vigenere')
+    deciphered, found_key, _ = crack_vigenere(vigenere_encipher(text, key))
+    return deciphered, found_key
+
+# Enciphers the text of the file with the Vigenere key then returns the (deciphered text, key) that "cipher_crack.crack_vigenere" finds
+def crack_vigenere_file(file_path: str, key: str) -> Tuple[str, str]:
+    return crack_vigenere_text(read_text_file(file_path), key)
+
+# Capitalizes every n-th word of the text (starting from the first one)
+def capitalize_words(text: str, n: int) -> str:
+    return ' '.join(word.capitalize() if index % n == 0 else word for index, word in enumerate(text.split(' ')))
+
+# Enciphers the text of the file with the affine key (a, b) then returns the (deciphered text, key) that "cipher_crack.crack_affine" finds
+def crack_affine_file(file_path: str, a: int, b: int) -> Tuple[str, Tuple[int, int]]:
+    affine_encipher = load_function('cipher_crack.affine_encipher')
+    crack_affine = load_function('cipher_crack.crack_affine')
+    deciphered, found_key, _ = crack_affine(affine_encipher(read_text_file(file_path), a, b))
+    return deciphered, found_key
+
+# Returns the values whose true count is not within the bounds reported by "histogram_stream.top_k" (estimated count - error, estimated count)
+def top_k_bound_violations(values: List[Hashable], k: int, capacity: int) -> List[Hashable]:
+    top_k = load_function('histogram_stream.top_k')
+    counts = Counter(values)
+    return [value for value, count, error in top_k(values, k, capacity) if not count - error <= counts[value] <= count]
+
+# Returns the values whose count is underestimated by "histogram_stream.CountMinSketch"
+def count_min_underestimates(values: List[Hashable], width: int, depth: int) -> List[Hashable]:
+    sketch = load_function('histogram_stream.CountMinSketch')(width, depth)
+    sketch.update(values)
+    return [value for value, count in Counter(values).items() if sketch.count(value) < count]
+
+# Returns the relative error of the distinct count estimated by "histogram_stream.count_distinct"
+def count_distinct_error(values: Iterable[Hashable], precision: int = 12) -> float:
+    values = list(values)
+    expected = len(set(values))
+    return abs(load_function('histogram_stream.count_distinct')(values, precision) - expected) / expected
+
+# Returns the distinct count of the union of two halves estimated by merging their "histogram_stream.HyperLogLog" sketches
+def merged_distinct_count(first: Iterable[Hashable], second: Iterable[Hashable], precision: int = 12) -> int:
+    HyperLogLog = load_function('histogram_stream.HyperLogLog')
+    sketch, other = HyperLogLog(precision), HyperLogLog(precision)
+    sketch.update(first)
+    other.update(second)
+    sketch.merge(other)
+    return sketch.count()
+
+# Writes the values to a temporary file (one per line) then returns its histogram computed by "histogram_parallel.parallel_histogram"
+def parallel_histogram_of_lines(values: List[Hashable], newline: str = "\n", workers: int = 1, chunk_size: int = 1 << 20, integers: bool = False) -> dict:
+    parallel_histogram = load_function('histogram_parallel.parallel_histogram')
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "values.txt")
+        with open(path, 'w', newline="") as f:
+            f.write("".join(f"{value}{newline}" for value in values))
+        return parallel_histogram([path], workers, chunk_size, integers)
+
+# Sets the cells of the grid from a dictionary of {(x, y): value} or a list of ((x, y), value) pairs (in order) and returns the grid
+def set_cells(grid: Any, changes: Union[Dict[Tuple[int, int], Any], List[Tuple[Tuple[int, int], Any]]]) -> Any:
+    for position, value in (changes.items() if isinstance(changes, dict) else changes):
+        grid[position] = value
+    return grid
+
+# Returns the positions of each item found by calling "locator.locate" once per item
+def locate_each(grid: Any, items: Iterable[Any]) -> Dict[Any, set]:
+    locate = load_function('locator.locate')
+    return {item: locate(grid, item) for item in items}
+
+# Creates a "college.Gradebook" of the courses then adds the (student id, course index, grade) tuples to it in order
+def build_gradebook(courses: List[Any], grades: Iterable[Tuple[str, int, str]] = ()) -> Any:
+    gradebook = load_function('college.Gradebook')(courses=courses)
+    for student_id, course_index, grade in grades:
+        gradebook.add_grade(load_function('college.Student')(student_id, ""), courses[course_index], grade)
+    return gradebook
+
+# Returns an in-memory "college_store.CollegeStore" that contains the students and courses (with their grades)
+# A sqlite connection can only be used by the thread that created it, so the stores are created by the tested functions (not by the input arguments)
+def college_store_of(students: Iterable[Any], courses: Iterable[Any]) -> Any:
+    store = load_function('college_store.CollegeStore')()
+    store.save(students, courses)
+    return store
+
+# Writes the CSV contents to temporary files then returns an in-memory "college_store.CollegeStore" that imported them
+def college_store_from_csv(students_csv: str, courses_csv: str, grades_csv: str) -> Any:
+    store = load_function('college_store.CollegeStore')()
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for name, content in (("students", students_csv), ("courses", courses_csv), ("grades", grades_csv)):
+            paths.append(os.path.join(directory, name + ".csv"))
+            with open(paths[-1], 'w', newline='') as f:
+                f.write(content)
+        store.import_csv(*paths)
+    return store
+
+# Writes the content (text is written without translating its line endings) to a temporary file then returns function(file path, *args, **kwargs)
+def call_with_temporary_file(content: Union[str, bytes], function: Callable, *args, **kwargs) -> Any:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "content")
+        with open(path, 'wb') as f:
+            f.write(content.encode() if isinstance(content, str) else content)
+        return function(path, *args, **kwargs)
+
+# Counts the values in the rectangles (x0, y0, x1, y1) using "grid.count" before and after the changes {(x, y): value}
+# then returns the (value, rectangle, count, expected count) of every wrong count
+def grid_count_mismatches(grid: Any, values: List[Any], rectangles: List[Tuple[int, int, int, int]], changes: Dict[Tuple[int, int], Any] = {}) -> List[Tuple[Any, Tuple[int, int, int, int], int, int]]:
+    mismatches = []
+    for step in range(2):
+        if step == 1:
+            set_cells(grid, changes)
+        for value in values:
+            for rectangle in rectangles:
+                x0, y0, x1, y1 = rectangle
+                expected = sum(1 for y in range(max(0, y0), min(grid.height, y1)) for x in range(max(0, x0), min(grid.width, x1)) if grid[x, y] == value)
+                count = grid.count(value, x0, y0, x1, y1)
+                if count != expected:
+                    mismatches.append((value, rectangle, count, expected))
+    return mismatches
+
+# Returns the name of the exception raised by function(*args, **kwargs) or None if it returns normally
+def raised_error(function: Callable, *args, **kwargs) -> Optional[str]:
+    try:
+        function(*args, **kwargs)
+    except Exception as error:
+        return type(error).__name__
+    return None
+
+# Returns the (label rows, count, sizes, bounding boxes) of the components found by "components.label_components"
+def label_components_summary(grid: Any, *args, **kwargs) -> Tuple[List[List[int]], int, Dict[int, int], Dict[int, Tuple[int, int, int, int]]]:
+    components = load_function('components.label_components')(grid, *args, **kwargs)
+    return list(components.labels.rows()), components.count, components.sizes, components.bounding_boxes
+
+# Runs "python autograder.py --timescale 1 <arguments>" in a new process "runs" times (one after the other)
+# and returns the non-empty lines printed by the last run
+def run_autograder(arguments: List[str], runs: int = 1) -> List[str]:
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "autograder.py", "--timescale", "1", *arguments],
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL, text=True).stdout
+    return [line for line in output.splitlines() if line.strip()]
+
+# Runs the autograder incrementally with the arguments against two solution folders, one after the other:
+# the first one only has the module with the given source and the second one has a copy of the local module
+# Returns the total and the result cache lines printed by each run
+def incremental_solution_switch(arguments: List[str], module: str, source: str) -> List[List[str]]:
+    runs = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, content in (("first", source), ("second", read_text_file(module + ".py"))):
+            solution = os.path.join(directory, name)
+            os.makedirs(solution)
+            with open(os.path.join(solution, module + ".py"), 'w') as f:
+                f.write(content)
+            lines = run_autograder([*arguments, "--incremental", "--solution", solution])
+            runs.append([line for line in lines if line.startswith(('Problem Set Total', 'Result cache'))])
+    return runs
+
+# Runs the autograder with the arguments "runs" times, each run saving its report in a temporary file, and returns the content of every report
+def autograder_reports(arguments: List[str], runs: int = 2) -> List[str]:
+    reports = []
+    with tempfile.TemporaryDirectory() as directory:
+        for run in range(runs):
+            path = os.path.join(directory, f"report{run}")
+            run_autograder([*arguments, "--report-path", path])
+            with open(path, 'r') as f:
+                reports.append(f.read())
+    return reports
+
+# Runs the autograder with the arguments, saving the collapsed stacks of the profiles in a temporary folder,
+# and returns the names of the saved files with their stacks (without the sample counts)
+def autograder_profile_stacks(arguments: List[str]) -> Dict[str, List[str]]:
+    with tempfile.TemporaryDirectory() as directory:
+        run_autograder([*arguments, "--profile-stacks", directory])
+        stacks = {}
+        for name in sorted(os.listdir(directory)):
+            with open(os.path.join(directory, name), 'r') as f:
+                stacks[name] = [line.rsplit(" ", 1)[0] for line in f.read().splitlines()]
+        return stacks
@@ -0,0 +1,99 @@
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+import os
+import utils
+
+try:
+    import numpy as np
+except ImportError: # The integer fast path counts the distinct raw tokens instead of using numpy.bincount
+    np = None
+
+'''
+    A map-reduce histogram over many files where each line of a file is a value.
+    1. Map: the files are split into shards (byte ranges of at most "chunk_size" bytes that are aligned to lines)
+       and each worker process counts the values of a shard into a Counter.
+    2. Reduce: the Counters are merged pairwise in rounds (a tree reduction), each round in parallel,
+       so the merging is spread over the workers instead of being done by a single process.
+    The lines are split like python's text files split them (on "\n", "\r\n" or "\r"),
+    so the result is identical to "histogram_stream.exact_histogram" over all the files one after the other.
+    Note: shards are aligned to "\n", so files that only use "\r" as line endings must not be split (use a large chunk_size).
+
+    If the values are small non-negative integers (integers=True), the values are returned as integers
+    and each shard is counted with numpy.bincount if numpy is installed, otherwise the raw tokens are counted
+    and only the distinct tokens are converted to integers.
+'''
+
+# A shard is a (file path, start byte, end byte) tuple, the shard owns the lines that start in [start, end)
+Shard = Tuple[str, int, int]
+
+CHUNK_SIZE = 64 << 20
+
+def make_shards(paths: Sequence[str], chunk_size: int = CHUNK_SIZE) -> List[Shard]:
+    shards = []
+    for path in paths:
+        size = os.path.getsize(path)
+        shards.extend((path, start, min(start + chunk_size, size)) for start in range(0, size, chunk_size))
+    return shards
+
+def read_shard(shard: Shard) -> bytes:
+    path, start, end = shard
+    with open(path, 'rb') as f:
+        if start > 0:
+            # Skip the line that started in the previous shard
+            f.seek(start - 1)
+            f.readline()
+            start = f.tell()
+        if start >= end:
+            return b""
+        block = f.read(end - start)
+        # Finish the last line even if it goes beyond the end of the shard
+        if not block.endswith(b"\n"):
+            block += f.readline()
+        return block
+
+def count_shard(shard: Shard, integers: bool = False) -> Dict[Hashable, int]:
+    block = read_shard(shard)
+    if not integers:
+        return Counter(line.decode() for line in block.splitlines())
+    if np is not None:
+        values = np.array(block.split(), dtype=np.int64)
+        counts = np.bincount(values) if len(values) else np.zeros(0, dtype=np.int64)
+        return Counter({int(value): int(counts[value]) for value in np.flatnonzero(counts)})
+    counts = Counter()
+    for token, count in Counter(block.split()).items():
+        counts[int(token)] += count
+    return counts
+
+def merge_pair(counters: Tuple[Counter, Optional[Counter]]) -> Counter:
+    first, second = counters
+    if second is not None:
+        first.update(second)
+    return first
+
+def tree_reduce(counters: List[Counter], executor: Optional[Executor] = None) -> Counter:
+    '''
+        Merges the counters pairwise until only one is left.
+        If an executor is given, the pairs of each round are merged in parallel.
+    '''
+    if not counters:
+        return Counter()
+    while len(counters) > 1:
+        pairs = [(counters[index], counters[index+1] if index + 1 < len(counters) else None) for index in range(0, len(counters), 2)]
+        counters = list(executor.map(merge_pair, pairs) if executor is not None and len(pairs) > 1 else map(merge_pair, pairs))
+    return counters[0]
+
+def parallel_histogram(paths: Sequence[str], workers: Optional[int] = None,
+                       chunk_size: int = CHUNK_SIZE, integers: bool = False) -> Dict[Hashable, int]:
+    '''
+        This function returns the histogram of the lines of all the files.
+        The files are split into shards of at most "chunk_size" bytes that are counted by "workers" processes.
+        If workers is 1, everything is done in the current process.
+    '''
+    shards = make_shards(paths, chunk_size)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(shards) <= 1:
+        return dict(tree_reduce([count_shard(shard, integers) for shard in shards]))
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as executor:
+        counters = list(executor.map(count_shard, shards, [integers] * len(shards)))
+        return dict(tree_reduce(counters, executor))
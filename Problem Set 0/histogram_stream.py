@@ -0,0 +1,186 @@
+from collections import Counter
+from typing import Dict, Hashable, IO, Iterable, Iterator, List, Optional, Set, Tuple, Union
+import math, os
+import utils
+
+'''
+    Streaming histograms consume the values one by one (from any iterable or file) without materializing them.
+    Three kinds of summaries are available:
+    - Exact (exact_histogram): a dictionary with one entry per distinct value. Memory grows with the number of distinct values.
+    - Heavy hitters: the most frequent values using a bounded amount of memory.
+        * SpaceSaving keeps exactly "capacity" counters. After N values, every count is overestimated by at most N / capacity
+          (the error of each value is also reported) and every value that appears more than N / capacity times is kept.
+        * CountMinSketch keeps "depth" rows of "width" counters. Every estimated count is at least the true count,
+          and with a probability of at least 1 - exp(-depth), it overestimates by at most e * N / width.
+    - Distinct count (HyperLogLog): estimates the number of distinct values with 2^precision one-byte registers.
+      The relative standard error is about 1.04 / sqrt(2^precision) (1.6% for the default precision of 12, which uses 4 KB).
+'''
+
+Values = Union[Iterable[Hashable], IO[str], str, os.PathLike]
+
+def read_lines(file_path: Union[str, os.PathLike]) -> Iterator[str]:
+    with open(file_path, 'r') as f:
+        for line in f:
+            yield line.rstrip("\n")
+
+def iterate_values(values: Values) -> Iterable[Hashable]:
+    '''
+        If values is a file path or a text file, this returns an iterator over its lines (without the trailing newline).
+        Otherwise, the values are returned as they are (so C-level consumers like Counter iterate them directly).
+    '''
+    if isinstance(values, (str, os.PathLike)):
+        return read_lines(values)
+    if hasattr(values, "readline"):
+        return (line.rstrip("\n") for line in values)
+    return values
+
+def exact_histogram(values: Values) -> Dict[Hashable, int]:
+    # Counter counts the values in C, so this is the fastest exact histogram
+    return dict(Counter(iterate_values(values)))
+
+class SpaceSaving:
+    '''
+        The Space-Saving algorithm (Metwally et al.) for the most frequent values.
+        The counters are grouped into buckets of equal counts (a "stream summary")
+        so that updating a value and finding a minimum counter are both O(1).
+    '''
+    def __init__(self, capacity: int = 1000) -> None:
+        self.capacity = capacity
+        self.total = 0
+        self.counts: Dict[Hashable, int] = {}
+        self.errors: Dict[Hashable, int] = {}
+        self.buckets: Dict[int, Set[Hashable]] = {}
+        self.minimum = 0
+
+    def __move(self, value: Hashable, old_count: int, new_count: int):
+        self.counts[value] = new_count
+        self.buckets.setdefault(new_count, set()).add(value)
+        bucket = self.buckets.get(old_count)
+        if bucket is not None:
+            bucket.discard(value)
+            if not bucket:
+                del self.buckets[old_count]
+                if self.minimum == old_count:
+                    self.minimum = new_count if new_count == old_count + 1 else min(self.buckets)
+
+    def add(self, value: Hashable, count: int = 1):
+        self.total += count
+        old_count = self.counts.get(value)
+        if old_count is not None:
+            self.__move(value, old_count, old_count + count)
+        elif len(self.counts) < self.capacity:
+            self.errors[value] = 0
+            self.__move(value, None, count)
+            self.minimum = count if len(self.counts) == 1 else min(self.minimum, count)
+        else:
+            # Replace a value with the minimum count, the new value inherits its count as an error
+            minimum = self.minimum
+            bucket = self.buckets[minimum]
+            evicted = bucket.pop()
+            del self.counts[evicted], self.errors[evicted]
+            self.errors[value] = minimum
+            bucket.add(value)
+            self.__move(value, minimum, minimum + count)
+
+    def update(self, values: Values):
+        add = self.add
+        for value in iterate_values(values):
+            add(value)
+
+    def top(self, k: int) -> List[Tuple[Hashable, int, int]]:
+        '''
+            Returns up to k (value, estimated count, maximum overestimation) tuples sorted by the estimated count.
+            The true count of each value is between "estimated count - maximum overestimation" and "estimated count".
+        '''
+        ranked = sorted(self.counts.items(), key=lambda item: -item[1])[:k]
+        return [(value, count, self.errors[value]) for value, count in ranked]
+
+class CountMinSketch:
+    '''
+        A Count-Min sketch: a value is hashed to one counter per row and its estimated count is the minimum of its counters.
+        Use "from_error" to choose the size from the accepted error (epsilon * N) and failure probability (delta).
+    '''
+    def __init__(self, width: int = 2048, depth: int = 4) -> None:
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self.rows = [[0] * width for _ in range(depth)]
+        self.salts = [(row + 1) * 0x9E3779B97F4A7C15 for row in range(depth)]
+
+    @staticmethod
+    def from_error(epsilon: float, delta: float) -> 'CountMinSketch':
+        return CountMinSketch(math.ceil(math.e / epsilon), math.ceil(math.log(1 / delta)))
+
+    def add(self, value: Hashable, count: int = 1):
+        self.total += count
+        width = self.width
+        for row, salt in zip(self.rows, self.salts):
+            row[hash((salt, value)) % width] += count
+
+    def update(self, values: Values):
+        add = self.add
+        for value in iterate_values(values):
+            add(value)
+
+    def count(self, value: Hashable) -> int:
+        width = self.width
+        return min(row[hash((salt, value)) % width] for row, salt in zip(self.rows, self.salts))
+
+MASK_64 = (1 << 64) - 1
+
+# Spreads the bits of python's hash (which is the identity for small integers) over all the 64 bits (splitmix64 finalizer)
+def mix_hash(value: Hashable) -> int:
+    x = hash(value) & MASK_64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return x ^ (x >> 31)
+
+class HyperLogLog:
+    '''
+        HyperLogLog (Flajolet et al.) distinct count estimator with 2^precision registers.
+        The first "precision" bits of the hash select a register which keeps the maximum position of the first 1-bit in the rest.
+        Small cardinalities are corrected with linear counting.
+        Note: python's hash of strings changes between processes, so sketches of different processes cannot be merged.
+    '''
+    def __init__(self, precision: int = 12) -> None:
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(self.size)
+        self.alpha = 0.7213 / (1 + 1.079 / self.size)
+
+    def add(self, value: Hashable):
+        x = mix_hash(value)
+        remaining_bits = 64 - self.precision
+        index = x >> remaining_bits
+        rank = remaining_bits - (x & ((1 << remaining_bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values: Values):
+        add = self.add
+        for value in iterate_values(values):
+            add(value)
+
+    def merge(self, other: 'HyperLogLog'):
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        estimate = self.alpha * self.size * self.size / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.size and zeros:
+            estimate = self.size * math.log(self.size / zeros)
+        return round(estimate)
+
+def top_k(values: Values, k: int, capacity: Optional[int] = None) -> List[Tuple[Hashable, int, int]]:
+    '''
+        Returns the k most frequent values as (value, estimated count, maximum overestimation) using Space-Saving.
+        By default, the summary keeps 10 * k counters.
+    '''
+    summary = SpaceSaving(capacity or 10 * k)
+    summary.update(values)
+    return summary.top(k)
+
+def count_distinct(values: Values, precision: int = 12) -> int:
+    sketch = HyperLogLog(precision)
+    sketch.update(values)
+    return sketch.count()
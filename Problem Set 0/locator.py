@@ -1,7 +1,12 @@
-from typing import Any, Set, Tuple
+from typing import Any, Dict, Iterable, Set, Tuple
 from grid import Grid
 import utils
 
+try:
+    import numpy as np
+except ImportError: # locate_many falls back to a pure python pass if numpy is not installed
+    np = None
+
 def locate(grid: Grid, item: Any) -> Set[Tuple[int,int]]:
     '''
     This function takes a 2D grid and an item
@@ -9,9 +14,61 @@ def locate(grid: Grid, item: Any) -> Set[Tuple[int,int]]:
     To know how to use the Grid class, see the file "grid.py"  
     '''
     #TODO: ADD YOUR CODE HERE
+    # Grids that can find the positions of an item by themselves (e.g. using an index) do it in O(matches)
+    if hasattr(grid, "positions"):
+        return grid.positions(item)
     locations = set()
     for i in range(grid.width):
         for j in range(grid.height):
             if grid.__getitem__((i,j))==item :
                 locations.add((i,j))
-    return locations
\ No newline at end of file
+    return locations
+
+def locate_many(grid: Grid, items: Iterable[Any]) -> Dict[Any, Set[Tuple[int,int]]]:
+    '''
+    This function returns a dictionary from each item to the set of (x, y) coordinates that contain it
+    It is the same as calling "locate" for each item, but the grid is scanned only once (row by row)
+    If numpy is installed and the grid only contains numbers, the numeric items are compared as arrays
+    The result has one key per distinct item: items that are equal and hash the same (e.g. 1, 1.0 and True) share the first one's key,
+    which loses nothing since "locate" returns the same positions for all of them
+    '''
+    locations = {item: set() for item in items}
+    if getattr(grid, "indexed", False):
+        return {item: grid.positions(item) for item in locations}
+    if hasattr(grid, "occupied"):
+        # Sparse grids: only visit the filled cells (the empty cells are only enumerated if None is requested)
+        try:
+            for position, cell in grid.occupied():
+                positions = locations.get(cell)
+                if positions is not None:
+                    positions.add(position)
+        except TypeError: # Unhashable cells cannot be looked up
+            return {item: grid.positions(item) for item in locations}
+        if None in locations:
+            locations[None] = grid.positions(None)
+        return locations
+    rows = list(grid.rows())
+    if np is not None and rows and all(isinstance(item, (int, float)) for item in locations):
+        try:
+            array = np.array(rows)
+        except (ValueError, TypeError): # Ragged sequence cells cannot form an array
+            array = None
+        if array is not None and array.ndim == 2 and array.dtype.kind in "biuf":
+            for item, positions in locations.items():
+                ys, xs = np.nonzero(array == item)
+                positions.update(zip(xs.tolist(), ys.tolist()))
+            return locations
+    try:
+        for y, row in enumerate(rows):
+            for x, cell in enumerate(row):
+                positions = locations.get(cell)
+                if positions is not None:
+                    positions.add((x, y))
+    except TypeError: # Unhashable cells cannot be looked up, so compare them with each item instead
+        for positions in locations.values(): positions.clear()
+        for y, row in enumerate(rows):
+            for x, cell in enumerate(row):
+                for item, positions in locations.items():
+                    if cell == item:
+                        positions.add((x, y))
+    return locations
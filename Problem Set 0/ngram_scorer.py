@@ -0,0 +1,143 @@
+from array import array
+from typing import Dict, Iterable, List, Optional
+import math, os
+import utils
+
+try:
+    import numpy as np
+except ImportError: # The scorer falls back to pure python if numpy is not installed
+    np = None
+
+'''
+    The NgramScorer measures how much a text looks like English using quadgram (4 consecutive letters) log-probabilities.
+    Only the letters of the text are used (spaces, punctuation and word boundaries are ignored).
+    Each letter is converted to a code from 0 to 25, so a quadgram is packed into a single integer
+        index = a * 26^3 + b * 26^2 + c * 26 + d
+    which is used to index a flat array of 26^4 log10-probabilities (quadgrams that were never seen get a floor value).
+    The score of a text is the sum of the log-probabilities of all its quadgrams (higher is more English-like).
+    With numpy, all the windows are scored at once, otherwise a rolling index is updated letter by letter.
+'''
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+QUADGRAM_COUNT = 26 ** 4
+
+# Maps the bytes of lowercase letters to their codes (0 to 25) and deletes every other byte
+LETTER_CODE_TABLE = bytes.maketrans(ALPHABET.encode(), bytes(range(26)))
+NON_LETTER_BYTES = bytes(set(range(256)) - set(ALPHABET.encode()))
+
+# Maps the letter codes to the codes shifted "shift" steps to the left (the codes of the Caesar deciphered letters)
+CODE_SHIFT_TABLES = [
+    bytes((code - shift) % 26 for code in range(26)) + bytes(230)
+    for shift in range(26)
+]
+
+def letter_codes(text: str, lowercase: bool = True) -> bytes:
+    '''
+        Returns the letters of the text as a bytes object of letter codes (0 to 25).
+        The text is lowercased (unless lowercase is False) and every character that is not a letter from 'a' to 'z' is dropped.
+        Ciphered texts should not be lowercased since the ciphers only encipher the lowercase letters (the uppercase ones are kept as they are).
+    '''
+    if lowercase:
+        text = text.lower()
+    return text.encode("ascii", "ignore").translate(LETTER_CODE_TABLE, NON_LETTER_BYTES)
+
+def pack_quadgram(quadgram: str) -> int:
+    index = 0
+    for letter in quadgram.lower():
+        index = index * 26 + ALPHABET.index(letter)
+    return index
+
+class NgramScorer:
+    def __init__(self, log_probabilities: array, floor: float) -> None:
+        self.table = log_probabilities
+        self.floor = floor
+        self.__numpy_table = None if np is None else np.frombuffer(log_probabilities, dtype=np.float64)
+
+    @staticmethod
+    def from_counts(counts: Dict[int, float]) -> 'NgramScorer':
+        '''
+            Creates a scorer from the counts of the quadgrams (keyed by their packed index).
+            The counts can be fractional (weighted), so the unseen quadgrams get 1% of the smallest count.
+        '''
+        total = sum(counts.values())
+        floor = math.log10(0.01 * min(counts.values()) / total)
+        table = array('d', [floor]) * QUADGRAM_COUNT
+        for index, count in counts.items():
+            table[index] = math.log10(count / total)
+        return NgramScorer(table, floor)
+
+    @staticmethod
+    def from_file(file_path: str) -> 'NgramScorer':
+        '''
+            Loads a quadgram table where each line contains a quadgram and its count separated by whitespace.
+            For example: "TION 13168375"
+        '''
+        counts = {}
+        with open(file_path, 'r') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2 and len(parts[0]) == 4:
+                    counts[pack_quadgram(parts[0])] = counts.get(pack_quadgram(parts[0]), 0) + float(parts[1])
+        return NgramScorer.from_counts(counts)
+
+    @staticmethod
+    def from_texts(texts: Iterable[str], weights: Optional[Iterable[float]] = None) -> 'NgramScorer':
+        '''
+            Counts the quadgrams of the given texts (each one can have a weight) and creates a scorer from them.
+        '''
+        counts = {}
+        weights = weights if weights is not None else iter(lambda: 1.0, None)
+        for text, weight in zip(texts, weights):
+            codes = letter_codes(text)
+            for start in range(len(codes) - 3):
+                a, b, c, d = codes[start:start+4]
+                index = ((a * 26 + b) * 26 + c) * 26 + d
+                counts[index] = counts.get(index, 0) + weight
+        return NgramScorer.from_counts(counts)
+
+    def score_codes(self, codes: bytes) -> float:
+        '''
+            Returns the sum of the log-probabilities of all the quadgrams of the letter codes.
+        '''
+        if len(codes) < 4:
+            return 0.0
+        if self.__numpy_table is not None:
+            values = np.frombuffer(codes, dtype=np.uint8).astype(np.intp)
+            indices = ((values[:-3] * 26 + values[1:-2]) * 26 + values[2:-1]) * 26 + values[3:]
+            return float(self.__numpy_table[indices].sum())
+        table = self.table
+        index = (codes[0] * 26 + codes[1]) * 26 + codes[2]
+        score = 0.0
+        for code in codes[3:]:
+            index = (index % 17576) * 26 + code
+            score += table[index]
+        return score
+
+    def score(self, text: str) -> float:
+        return self.score_codes(letter_codes(text))
+
+    def rank_shifts(self, ciphered: str, sample_size: int = 2000) -> List[int]:
+        '''
+            Returns the 26 Caesar shifts (1 to 26) sorted from the most to the least likely.
+            Only the first "sample_size" letters are scored, which is more than enough to tell English apart.
+            This can be passed to "caesar.caesar_dechiper_ranked" as its scorer.
+        '''
+        codes = letter_codes(ciphered[:sample_size * 2])[:sample_size]
+        scores = [(-self.score_codes(codes.translate(CODE_SHIFT_TABLES[shift % 26])), shift) for shift in range(1, 27)]
+        scores.sort()
+        return [shift for _, shift in scores]
+
+# The default scorer is trained once per process on the English word list
+# Since the list is sorted by frequency, the words are weighted following Zipf's law (1 / rank)
+# Quadgrams across word boundaries are never seen, but this is enough to tell English apart from the wrong keys
+_default_scorers: Dict[str, NgramScorer] = {}
+
+def load_default_scorer(word_list_path: str = "data/english.txt") -> NgramScorer:
+    key = os.path.abspath(word_list_path)
+    scorer = _default_scorers.get(key)
+    if scorer is None:
+        with open(word_list_path, 'r') as f:
+            words = [line.lower().strip() for line in f]
+        scorer = NgramScorer.from_texts(words, [1 / rank for rank in range(1, len(words) + 1)])
+        _default_scorers[key] = scorer
+    return scorer
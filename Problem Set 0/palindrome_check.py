@@ -1,5 +1,15 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Union
+import mmap, os
+from histogram_parallel import make_shards, read_shard
 import utils
 
+# A buffer is any object that supports the buffer protocol (bytes, bytearray, memoryview, mmap, ...)
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+# The number of bytes compared at a time from each end of a buffer
+BLOCK_SIZE = 1 << 16
+
 def palindrome_check(string: str) -> bool:
     '''
     This function takes string and returns where a string is a palindrome or not
@@ -7,4 +17,47 @@ def palindrome_check(string: str) -> bool:
     Assume that empty strings are palindromes
     '''
     #TODO: ADD YOUR CODE HERE
-    return string == string[::-1]
\ No newline at end of file
+    return string == string[::-1]
+
+def palindrome_check_buffer(buffer: Buffer, block_size: int = BLOCK_SIZE) -> bool:
+    '''
+    This function checks if the bytes of the buffer form a palindrome without copying the whole buffer
+    It compares a block from the start with the reversed block at the same distance from the end, moving both inward
+    So the memory used is O(block_size) regardless of the size of the buffer
+    Note that bytes are compared, so for text, it is the same as "palindrome_check" only for single-byte encodings (e.g. ASCII)
+    '''
+    view = memoryview(buffer).cast('B')
+    size = len(view)
+    for start in range(0, size // 2, block_size):
+        length = min(block_size, size // 2 - start)
+        front = view[start:start+length]
+        back = bytes(view[size-start-length:size-start])
+        if front != back[::-1]:
+            return False
+    return True
+
+def palindrome_check_file(file_path: str, block_size: int = BLOCK_SIZE) -> bool:
+    '''
+    This function checks if the content of the file (as bytes) is a palindrome
+    The file is memory-mapped, so only the compared blocks are read from the disk
+    '''
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0: # Empty files cannot be memory-mapped (and are palindromes)
+            return True
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return palindrome_check_buffer(buffer, block_size)
+
+def check_shard_lines(shard) -> List[bool]:
+    return [palindrome_check(line.decode()) for line in read_shard(shard).splitlines()]
+
+def palindrome_check_lines(file_path: str, workers: Optional[int] = None, chunk_size: int = 16 << 20) -> List[bool]:
+    '''
+    This function checks every line of the file (without its line ending) and returns the results in the order of the lines
+    The file is split into shards of lines (see "histogram_parallel.make_shards") that are checked by "workers" processes
+    '''
+    shards = make_shards([file_path], chunk_size)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(shards) <= 1:
+        return [result for shard in shards for result in check_shard_lines(shard)]
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as executor:
+        return [result for results in executor.map(check_shard_lines, shards) for result in results]
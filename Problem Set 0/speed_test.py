@@ -1,10 +1,23 @@
-import time
+import time, math, statistics
+from typing import Callable, Dict, List, Tuple
+from helpers.bench import machine_key
 
-def math_test(steps: int = int(1e7), verbose: bool = False) -> float:
-    # This speed test approximates PI
-    # by integrating the arc length of the function sqrt(1 - x^2) over x in [0, 1] to get PI/2
-    start = time.time()
+'''
+    The speed test compares this machine with the grading machine on two workloads:
+    - Math: approximates PI by integrating the arc length of sqrt(1 - x^2) over x in [0, 1] (pure python arithmetic).
+    - Sort: generates random integers then sorts them (allocations and a C-level sort).
+    The grading machine needs 12 seconds for 10^7 math steps and 24 seconds for 10^7 sorted items.
+
+    The full test (speed_test) runs each workload once at full size, which takes tens of seconds.
+    The calibration (calibrate) runs short rounds of both workloads instead, measured with perf_counter.
+    Consecutive rounds are not independent (the CPU frequency, the caches and other processes change slowly),
+    so the first rounds are discarded as a warm-up and the rounds are grouped in blocks:
+    the value of a block is its fastest round (noise only slows rounds down) and the confidence interval is computed
+    over the block values. It stops as soon as the interval is narrow enough (or the time budget is used).
+    The result is cached in "time_config.json" for each CPU model and python version.
+'''
 
+def math_workload(steps: int) -> float:
     arc_length = 0
     x, y = 0, 1
     for index in range(1, steps+1):
@@ -14,33 +27,37 @@ def math_test(steps: int = int(1e7), verbose: bool = False) -> float:
         dy = new_y - y
         arc_length += (dx * dx + dy * dy) ** 0.5
         x, y = new_x, new_y
-    pi = 2 * arc_length
-
-    elapsed = time.time() - start
-
-    if verbose: print(f"Math Test: Done in {elapsed} seconds")
-    
-    return elapsed
+    return 2 * arc_length
 
-def sort_test(size: int = int(1e7), verbose: bool = False) -> float:
+def sort_workload(size: int) -> List[int]:
     import random
-
-    start = time.time()
-
     random.seed(123)
     data = [random.randint(0, 1000) for _ in range(size)]
     data.sort()
+    return data
+
+# Returns the wall time and the CPU time of the workload in seconds
+def measure(workload: Callable[[int], object], size: int) -> Tuple[float, float]:
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    workload(size)
+    return time.perf_counter() - wall_start, time.process_time() - cpu_start
 
-    elapsed = time.time() - start
+def math_test(steps: int = int(1e7), verbose: bool = False) -> float:
+    elapsed, _ = measure(math_workload, steps)
+    if verbose: print(f"Math Test: Done in {elapsed} seconds")
+    return elapsed
 
+def sort_test(size: int = int(1e7), verbose: bool = False) -> float:
+    elapsed, _ = measure(sort_workload, size)
     if verbose: print(f"Sort Test: Done in {elapsed} seconds")
-    
     return elapsed
 
 def warm_up():
     math_test(int(1e5))
     sort_test(int(1e5))
 
+# The reference times are for 10^7 steps/items
+reference_size = int(1e7)
 math_reference_time = 12
 sort_reference_time = 24
 
@@ -50,21 +67,112 @@ def speed_test() -> float:
     multiplier = min([math_time / math_reference_time, sort_time / sort_reference_time])
     return multiplier
 
-def get_time_limit_multiplier(overwrite: bool = False):
+# Calibration settings: each round takes about 50ms on the grading machine
+calibration_math_steps = int(2e4)
+calibration_sort_size = int(1e4)
+calibration_budget = 1.5        # The maximum number of seconds spent in calibration rounds
+calibration_warm_up = 0.2       # The number of seconds of rounds that are discarded before measuring
+calibration_block_rounds = 5    # The number of rounds in a block
+calibration_min_blocks = 5
+calibration_max_spread = 0.1    # Stop when the confidence interval of the median is within 10% of the median
+
+def median_confidence_interval(samples: List[float], z: float = 1.96) -> Tuple[float, float, float]:
+    '''
+        Returns (lower bound, median, upper bound) where the bounds are order statistics that contain
+        the true median with a confidence of about 95% (z = 1.96) without assuming any distribution of the samples.
+    '''
+    ordered = sorted(samples)
+    count = len(ordered)
+    half_width = z * math.sqrt(count) / 2
+    lower = ordered[max(0, math.floor(count / 2 - half_width))]
+    upper = ordered[min(count - 1, math.ceil(count / 2 + half_width))]
+    return lower, statistics.median(ordered), upper
+
+def calibrate(budget: float = calibration_budget, verbose: bool = False) -> Dict[str, float]:
+    '''
+        Runs short rounds of the math and sort workloads, after "calibration_warm_up" seconds of discarded rounds,
+        in blocks of "calibration_block_rounds" rounds until the confidence interval of the median block multiplier
+        is narrower than "calibration_max_spread" of the median (after at least "calibration_min_blocks" blocks)
+        or until the next block would exceed the budget.
+        Like the full test, the multiplier of a round is the minimum of the math and sort ratios,
+        and the multiplier of a block is the minimum of its rounds.
+        Returns the median multiplier, its confidence bounds, the median CPU-time multiplier, the rounds and the elapsed time.
+    '''
+    import gc
+    math_reference = math_reference_time * calibration_math_steps / reference_size
+    sort_reference = sort_reference_time * calibration_sort_size / reference_size
+    def run_round() -> Tuple[float, float]:
+        math_wall, math_cpu = measure(math_workload, calibration_math_steps)
+        sort_wall, sort_cpu = measure(sort_workload, calibration_sort_size)
+        return min(math_wall / math_reference, sort_wall / sort_reference), min(math_cpu / math_reference, sort_cpu / sort_reference)
+    start = time.perf_counter()
+    run_round()
+    while time.perf_counter() - start < min(calibration_warm_up, budget / 2):
+        run_round()
+    wall_multipliers, cpu_multipliers = [], []
+    while True:
+        block_start = time.perf_counter()
+        gc.collect()
+        block = [run_round() for _ in range(calibration_block_rounds)]
+        wall_multipliers.append(min(wall for wall, _ in block))
+        cpu_multipliers.append(min(cpu for _, cpu in block))
+        now = time.perf_counter()
+        if len(wall_multipliers) >= calibration_min_blocks:
+            lower, median, upper = median_confidence_interval(wall_multipliers)
+            if upper - lower <= calibration_max_spread * median: break
+        if now - start + (now - block_start) > budget: break
+    lower, median, upper = median_confidence_interval(wall_multipliers)
+    elapsed = time.perf_counter() - start
+    rounds = len(wall_multipliers) * calibration_block_rounds
+    if verbose:
+        print(f"Calibration: {rounds} rounds in {elapsed:.2f} seconds, multiplier {median:.4f} (95% confidence: {lower:.4f} - {upper:.4f})")
+    return {
+        "multiplier": median,
+        "lower": lower,
+        "upper": upper,
+        "cpu_multiplier": statistics.median(cpu_multipliers),
+        "rounds": rounds,
+        "seconds": elapsed,
+    }
+
+def get_time_limit_multiplier(overwrite: bool = False, full: bool = False):
+    '''
+        Returns the cached multiplier of this machine or measures it (with the calibration, or the full test if full is True).
+        A "time_config.json" without calibrations (only a "multiplier") is used as it is.
+    '''
     import os, json
     file_name = "time_config.json"
-    if not overwrite and os.path.exists(file_name):
-        return json.load(open(file_name, 'r'))["multiplier"]
-    else:
-        print("Measuring the speed of your machine...")
+    config = {}
+    if os.path.exists(file_name):
+        with open(file_name, 'r') as f:
+            config = json.load(f)
+    key = machine_key()
+    calibrations = config.get("calibrations", {})
+    if not overwrite:
+        if key in calibrations:
+            return calibrations[key]["multiplier"]
+        if "multiplier" in config and "calibrations" not in config:
+            return config["multiplier"]
+    print("Measuring the speed of your machine...")
+    if full:
         warm_up()
         multiplier = speed_test()
-        if multiplier < 1:
-            print(f"Your machine is {1.0/multiplier} times faster than the grading machine. Time limits will be decreased accordingly.")
-        elif multiplier > 1:
-            print(f"Your machine is {multiplier} time slower than the grading machine. Time limits will be increased accordingly.")
-        json.dump({'multiplier':multiplier}, open(file_name, 'w'), indent=2)
-        return multiplier
+        calibration = {"multiplier": multiplier, "full": True}
+    else:
+        calibration = calibrate(verbose=True)
+        multiplier = calibration["multiplier"]
+    if multiplier < 1:
+        print(f"Your machine is {1.0/multiplier} times faster than the grading machine. Time limits will be decreased accordingly.")
+    elif multiplier > 1:
+        print(f"Your machine is {multiplier} time slower than the grading machine. Time limits will be increased accordingly.")
+    calibrations[key] = calibration
+    with open(file_name, 'w') as f:
+        json.dump({'multiplier': multiplier, 'calibrations': calibrations}, f, indent=2)
+    return multiplier
 
 if __name__ == "__main__":
-    get_time_limit_multiplier(overwrite=True)
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Measures the speed of this machine relative to the grading machine")
+    parser.add_argument("--full", "-f", action="store_true", help="Runs the full speed test (tens of seconds) instead of the fast calibration")
+    args = parser.parse_args()
+    get_time_limit_multiplier(overwrite=True, full=args.full)
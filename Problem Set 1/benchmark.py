@@ -0,0 +1,82 @@
+from typing import Callable, List
+from functools import lru_cache
+import argparse, glob, random
+
+from dungeon import DungeonProblem
+from parking import ParkingProblem, ParkingState
+from problem import HeuristicFunction, Problem
+from mathutils import manhattan_distance
+from helpers.bench import Workload, count_calls, run_suite, write_results
+
+'''
+    The benchmark suite of this problem set runs BFS, UCS and A* on every level in "dungeons/" and "parks/".
+    A* uses the strong heuristic on the dungeons and the total manhattan distance of the cars to their slots on the parks.
+    Like in the autograder's heuristic test, the heuristic is cached (with a new cache in every run).
+    The node count is the number of calls to "is_goal" (like the autograder).
+    It also runs UCS and A* (with the cheap weak heuristic) on generated dungeons of growing sizes
+    to show how the search time scales with the frontier size.
+'''
+
+# The levels that are too large for the uninformed searches (they explore every reachable state, which takes minutes)
+UNINFORMED_SKIPPED = {"dungeons/dungeon4.txt"}
+
+# The sizes of the generated dungeons (the number of states grows with the square of the size)
+GENERATED_SIZES = [16, 32, 64, 128]
+
+# Generates a square dungeon where about 20% of the inner tiles are walls, with the player at the top left corner,
+# the exit at the bottom right corner and one coin (the seed makes it the same in every run)
+def generate_dungeon(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    grid = [['#' if x in (0, size-1) or y in (0, size-1) or rng.random() < 0.2 else '.' for x in range(size)] for y in range(size)]
+    grid[1][1], grid[size-2][size-2] = '@', 'E'
+    x, y = rng.randrange(2, size-2), rng.randrange(2, size-2)
+    grid[y][x] = '$'
+    return '\n'.join(''.join(row) for row in grid)
+
+# The distance of each car to its slot (every move costs at least 1, so it never overestimates the cost)
+def parking_heuristic(problem: ParkingProblem, state: ParkingState) -> float:
+    slots = {index: position for position, index in problem.slots.items()}
+    return sum(manhattan_distance(car, slots[index]) for index, car in enumerate(state))
+
+def search_workload(name: str, load: Callable[[], Problem], algorithm: str, heuristic: HeuristicFunction = None) -> Workload:
+    def setup():
+        import search
+        search_fn = getattr(search, algorithm)
+        problem = load()
+        explored = count_calls(problem, "is_goal")
+        def run() -> int:
+            initial_state = problem.get_initial_state()
+            if heuristic is None:
+                search_fn(problem, initial_state)
+            else:
+                search_fn(problem, initial_state, lru_cache(2**16)(heuristic))
+            return explored()
+        return run
+    return Workload(name, setup)
+
+def get_workloads() -> List[Workload]:
+    from dungeon_heuristic import strong_heuristic, weak_heuristic
+    workloads = []
+    levels = [("dungeons", DungeonProblem.from_file, strong_heuristic), ("parks", ParkingProblem.from_file, parking_heuristic)]
+    for folder, from_file, heuristic in levels:
+        for path in sorted(glob.glob(f"{folder}/*.txt")):
+            load = lambda path=path, from_file=from_file: from_file(path)
+            if path not in UNINFORMED_SKIPPED:
+                workloads.append(search_workload(f"bfs/{path}", load, "BreadthFirstSearch"))
+                workloads.append(search_workload(f"ucs/{path}", load, "UniformCostSearch"))
+            workloads.append(search_workload(f"astar/{path}", load, "AStarSearch", heuristic))
+    for size in GENERATED_SIZES:
+        load = lambda size=size: DungeonProblem.from_text(generate_dungeon(size))
+        workloads.append(search_workload(f"ucs/generated/{size}x{size}", load, "UniformCostSearch"))
+        workloads.append(search_workload(f"astar/generated/{size}x{size}", load, "AStarSearch", weak_heuristic))
+    return workloads
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Runs the benchmark suite of the problem set")
+    parser.add_argument("--repeats", "-r", type=int, default=3, help="The number of timed runs of each workload")
+    parser.add_argument("--filter", "-f", default="*", help="A glob pattern to select the workloads by name (e.g. 'astar/*')")
+    parser.add_argument("--output", "-o", default=None, help="Saves the results in a JSON file")
+    args = parser.parse_args()
+    results = run_suite(get_workloads(), args.repeats, args.filter)
+    if args.output:
+        write_results(args.output, results)
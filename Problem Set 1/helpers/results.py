@@ -0,0 +1,149 @@
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from types import ModuleType
+import hashlib, json, os, pickle, sys
+from .fixtures import Dependency, describe_file, is_unchanged, referenced_files
+
+'''
+    The result cache stores the result and the measurements of every test case that ran in incremental mode,
+    so a test case is only run again if one of the files that it depends on changed:
+    - The testcase file and the data files that its expressions refer to.
+    - The local source files of the test: the modules loaded by "load_function" during the test, the modules of the
+      functions, comparators and inputs of the test, and the local modules that these modules use (through their globals).
+    - The autograder itself.
+    Each dependency is stored with its modification time, size and hash (like the fixture cache).
+    A test case is also run again if its problem, its time limit or the options that change its measurements are different,
+    or if it is graded against another solution folder ("--solution"): the absolute solution path is part of the key
+    and is recorded with the dependencies of each result.
+    Results that depend on the load of the machine (timeouts, crashes and memory errors) are never cached.
+'''
+
+CACHE_DIRECTORY = ".result_cache"
+
+# The messages of the results that are not cached
+UNCACHEABLE_MESSAGES = ("Timeout", "Run Failed", "Memory Limit Exceeded")
+
+def relative_path(path: str) -> str:
+    path = os.path.abspath(path)
+    root = os.getcwd()
+    return os.path.relpath(path, root) if path.startswith(root + os.sep) else path
+
+def is_local_module(module: Any, roots: List[str]) -> bool:
+    path = getattr(module, "__file__", None)
+    if not isinstance(module, ModuleType) or not path or "site-packages" in path:
+        return False
+    path = os.path.abspath(path)
+    return any(path.startswith(root + os.sep) for root in roots)
+
+def source_files(module_names: Iterable[str], values: Iterable[Any], roots: List[str]) -> Set[str]:
+    '''
+        Returns the source files of the local modules (under one of the roots) that are given by name or contain
+        the class (or the definition) of one of the values, and of the local modules that they use through their globals.
+    '''
+    roots = [os.path.abspath(root) for root in roots]
+    pending = [sys.modules.get(name) for name in module_names]
+    for value in values:
+        pending.append(sys.modules.get(getattr(value, "__module__", None) or type(value).__module__))
+    visited: Set[str] = set()
+    files: Set[str] = set()
+    while pending:
+        module = pending.pop()
+        if not is_local_module(module, roots) or module.__name__ in visited: continue
+        visited.add(module.__name__)
+        files.add(relative_path(module.__file__))
+        for value in list(vars(module).values()):
+            if isinstance(value, ModuleType):
+                pending.append(value)
+            else:
+                name = getattr(value, "__module__", None)
+                if isinstance(name, str): pending.append(sys.modules.get(name))
+    return files
+
+# The data files that the expressions of the test case refer to
+def test_case_files(test_case: Dict[str, Any]) -> Set[str]:
+    expressions = list(test_case.get("input_args", [])) + list(test_case.get("input_kwargs", {}).values())
+    expressions += list(test_case.get("comparison_args", [])) + list(test_case.get("comparison_kwargs", {}).values())
+    expressions += [test_case[key] for key in ("function", "comparator") if key in test_case]
+    return {path for expression in expressions if isinstance(expression, str) for path in referenced_files(expression)}
+
+def is_cacheable(result: Any) -> bool:
+    return result is None or not result.message.startswith(UNCACHEABLE_MESSAGES)
+
+class ResultCache:
+    def __init__(self, directory: str = CACHE_DIRECTORY, solution: str = "") -> None:
+        self.solution = os.path.abspath(solution) if solution else ""    # The solution folder (empty for the local modules)
+        self.path = os.path.join(directory, f"results-py{sys.version_info[0]}{sys.version_info[1]}.pickle")
+        self.entries: Dict[str, Dict[str, Any]] = {}    # The result, metrics and dependencies of each key
+        try:
+            with open(self.path, 'rb') as f:
+                self.entries = pickle.load(f)
+        except Exception: # No cache or an unreadable one
+            self.entries = {}
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    # The key of a test case is a hash of its path, the solution folder and everything else that changes its result or measurements
+    def key(self, test_case: Dict[str, Any], *variant: Any) -> str:
+        data = json.dumps([os.path.normpath(test_case.get("__path__", "")), self.solution, variant], sort_keys=True, default=repr)
+        return hashlib.sha1(data.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        '''
+            Returns the cached (result, metrics) of the key if none of its dependencies changed, otherwise None.
+            The metrics are the ones measured when the test case ran, with "cached" set to True.
+        '''
+        entry = self.entries.get(key)
+        if entry is not None and entry.get("solution") == self.solution and all(is_unchanged(path, dependency) for path, dependency in entry["dependencies"].items()):
+            self.hits += 1
+            return entry["result"], {**entry["metrics"], "cached": True}
+        self.misses += 1
+        return None
+
+    def put(self, key: str, test_case: Dict[str, Any], result: Any, metrics: Dict[str, Any], sources: Iterable[str]):
+        if not is_cacheable(result):
+            self.entries.pop(key, None)
+            return
+        paths = {test_case["__path__"]} | test_case_files(test_case) | set(sources)
+        dependencies: Dict[str, Dependency] = {}
+        for path in paths:
+            try:
+                dependencies[path] = describe_file(path)
+            except OSError: # A source file without a file (e.g. a frozen module) is ignored
+                continue
+        self.entries[key] = {"result": result, "metrics": metrics, "dependencies": dependencies, "solution": self.solution}
+        self.dirty = True
+
+    # The files that the cached results depend on
+    def dependencies(self) -> Set[str]:
+        return {path for entry in self.entries.values() for path in entry["dependencies"]}
+
+    # Saves the entries if they changed (the file is replaced atomically)
+    def save(self):
+        if not self.dirty: return
+        self.dirty = False
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary_path, 'wb') as f:
+            pickle.dump(self.entries, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, self.path)
+
+def snapshot_files(roots: List[str], extra: Iterable[str]) -> Dict[str, Tuple[int, int]]:
+    '''
+        Returns the (modification time in ns, size) of the python files under the roots (except hidden and cache folders),
+        the files under the "testcases" folder, and the extra files (e.g. the dependencies of the cached results).
+        The watch mode compares two snapshots to find the changed files.
+    '''
+    files = set(extra)
+    for root in roots:
+        for directory, folders, names in os.walk(root):
+            folders[:] = [folder for folder in folders if not folder.startswith(".") and folder != "__pycache__"]
+            in_testcases = "testcases" in os.path.relpath(directory, root).split(os.sep)
+            files.update(os.path.join(directory, name) for name in names if in_testcases or name.endswith(".py"))
+    snapshot = {}
+    for path in files:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        snapshot[relative_path(path)] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
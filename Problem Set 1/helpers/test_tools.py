@@ -1,10 +1,11 @@
-from typing import List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 from agents import HeuristicFunction
 from graph import GraphRoutingProblem, graphrouting_heuristic
 from dungeon import DungeonProblem, Direction
 from problem import A, S, Problem
 from .utils import Result, fetch_recorded_calls, fetch_tracked_call_count, load_function
 from .heuristic_checks import InconsistentHeuristicException, test_heuristic_consistency
+from .bench import Workload, count_calls, measure
 from functools import lru_cache
 import time
 
@@ -164,4 +165,60 @@ def compare_heuristic_for_dungeon(
         for i, (u, l) in enumerate(zip(thresholds[:-1], thresholds[1:])):
             message += '\n' + f'grade = {i+1} if {u} >= nodes > {l}'
         message += '\n' + f'grade = {len(thresholds)} if {thresholds[-1]} >= nodes'
-    return Result(grade != 0, grade, message)
\ No newline at end of file
+    return Result(grade != 0, grade, message)
+
+def count_goal_tests_for_graph_routing(
+    function_path: str,
+    problem: GraphRoutingProblem) -> int:
+    explored = count_calls(problem, "is_goal")
+    search_fn = load_function(function_path)
+    search_fn(problem, problem.get_initial_state())
+    return explored()
+
+def compare_benchmark_and_autograder_node_counts(
+    function_path: str,
+    level_path: str) -> Tuple[int, int]:
+    import benchmark
+    algorithm = function_path.rsplit(".", 1)[1]
+    nodes = measure(benchmark.search_workload(level_path, lambda: DungeonProblem.from_file(level_path), algorithm), repeats=1)["nodes"]
+    _, explored = run_uninformed_search_for_dungeon(function_path, DungeonProblem.from_file(level_path))
+    return nodes, explored
+
+def measure_fixed_workload(
+    node_counts: List[int],
+    repeats: int) -> Union[Dict[str, Any], str]:
+    runs = iter(node_counts)
+    workload = Workload("fixed", lambda: lambda: next(runs, node_counts[-1]))
+    try:
+        result = measure(workload, repeats)
+    except RuntimeError as error:
+        return str(error)
+    return {
+        "name": result["name"],
+        "nodes": result["nodes"],
+        "repeats": result["repeats"],
+        "ordered_times": 0 <= result["min_time"] <= result["median_time"],
+        "peak_memory": isinstance(result["peak_memory"], int) and result["peak_memory"] >= 0,
+    }
+
+def run_priority_frontier(
+    operations: List[Tuple]) -> List[Any]:
+    # Each operation is ("push", priority, state), ("pop",), ("len",) or ("contains", state)
+    # The path of a pushed state is [state], so the pops return (priority, state) after checking the path
+    frontier = load_function("search.PriorityFrontier")()
+    results = []
+    for name, *args in operations:
+        if name == "push":
+            priority, state = args
+            results.append(frontier.push(priority, state, [state]))
+        elif name == "pop":
+            try:
+                priority, state, path = frontier.pop()
+                results.append((priority, state) if path == [state] else ("wrong path", path))
+            except IndexError:
+                results.append("IndexError")
+        elif name == "len":
+            results.append(len(frontier))
+        elif name == "contains":
+            results.append(args[0] in frontier)
+    return results
@@ -1,7 +1,8 @@
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from types import ModuleType
 from dataclasses import dataclass
 from collections import deque
-import importlib, os, sys
+import importlib, functools, hashlib, os, sys, time
 from importlib import util as ilu
 import traceback
 
@@ -11,16 +12,77 @@ def set_solution_path(path: str):
     global solution_path
     solution_path = path
 
+# The folders of the local source files (the current folder and the solution path)
+def source_roots() -> List[str]:
+    return [os.getcwd()] + ([solution_path] if solution_path else [])
+
+# The solution modules that were already executed, keyed by (file path, sha256 of the file)
+# so each solution module is executed once per process (until its file changes or the cache is cleared)
+solution_modules: Dict[Tuple[str, str], ModuleType] = {}
+
+# The statistics of the solution module cache:
+# the number of executions and cache hits, the time spent executing the modules,
+# and the time saved by the hits (each hit saves the last execution time of its module)
+solution_module_statistics = {"executions": 0, "hits": 0, "execution_time": 0.0, "saved_time": 0.0}
+solution_module_times: Dict[str, float] = {}
+
+def clear_solution_modules(paths: Optional[List[str]] = None):
+    '''
+        Forgets the cached solution modules (all of them, or only those of the given file paths),
+        so they are executed again on the next load (use it when the solution files change, e.g. in watch mode).
+    '''
+    for key in list(solution_modules):
+        if paths is None or key[0] in paths:
+            module = solution_modules.pop(key)
+            if sys.modules.get(module.__name__) is module:
+                del sys.modules[module.__name__]
+
+def load_solution_module(path: str) -> ModuleType:
+    file_path = os.path.join(solution_path, path + ".py")
+    with open(file_path, 'rb') as f:
+        key = (os.path.abspath(file_path), hashlib.sha256(f.read()).hexdigest())
+    module = solution_modules.get(key)
+    if module is not None:
+        solution_module_statistics["hits"] += 1
+        solution_module_statistics["saved_time"] += solution_module_times.get(key[0], 0.0)
+        sys.modules[path] = module
+        return module
+    clear_solution_modules([key[0]])
+    start = time.perf_counter()
+    spec = ilu.spec_from_file_location(path, file_path)
+    module = ilu.module_from_spec(spec)
+    sys.modules[path] = module
+    try:
+        spec.loader.exec_module(module)
+    except:
+        del sys.modules[path]
+        raise
+    elapsed = time.perf_counter() - start
+    solution_module_statistics["executions"] += 1
+    solution_module_statistics["execution_time"] += elapsed
+    solution_module_times[key[0]] = elapsed
+    solution_modules[key] = module
+    return module
+
+# The names of the modules that load_function returned functions from
+# The autograder clears them before each test case to find the source files that the test depends on
+loaded_modules: Set[str] = set()
+
+def clear_loaded_modules() -> Set[str]:
+    names = set(loaded_modules)
+    loaded_modules.clear()
+    return names
+
+# Loads a function from the solution path (if set) or from the local modules
+# Note: like the local imports, a cached solution module keeps its module-level state between the tests
 def load_function(name: str, use_local: bool = False) -> Callable:
     try:
         path, function = name.rsplit(".", 1)
         if solution_path and not use_local:
-            spec = ilu.spec_from_file_location(path, os.path.join(solution_path, path + ".py"))
-            module = ilu.module_from_spec(spec)
-            sys.modules[path] = module
-            spec.loader.exec_module(module)
+            module = load_solution_module(path)
         else:
             module = importlib.import_module(path)
+        loaded_modules.add(module.__name__)
         return getattr(module, function)
     except Exception as err:
         print(f"Error while loading function {name}")
@@ -41,7 +103,17 @@ class Arguments:
 def NotImplemented():
     raise NotImplementedError()
 
+# The call counts fetched by "fetch_tracked_call_count" and "fetch_recorded_calls" (by the qualified name of the function)
+# The autograder clears them before each test case and adds them to its reports (the last fetched count of each function is kept)
+fetched_call_counts: Dict[str, int] = {}
+
+def clear_fetched_call_counts() -> Dict[str, int]:
+    counts = dict(fetched_call_counts)
+    fetched_call_counts.clear()
+    return counts
+
 def track_call_count(fn):
+    @functools.wraps(fn)
     def deco(*args, **kwargs):
         deco.calls += 1
         return fn(*args, **kwargs)
@@ -51,9 +123,11 @@ def track_call_count(fn):
 def fetch_tracked_call_count(fn):
     calls = getattr(fn, "calls", 0)
     setattr(fn, "calls", 0)
+    fetched_call_counts[getattr(fn, "__qualname__", repr(fn))] = calls
     return calls
 
 def record_calls(fn):
+    @functools.wraps(fn)
     def deco(*args, **kwargs):
         deco.calls.append({
             "args": args,
@@ -66,6 +140,7 @@ def record_calls(fn):
 def fetch_recorded_calls(fn):
     calls = getattr(fn, "calls", deque())
     setattr(fn, "calls", deque())
+    fetched_call_counts[getattr(fn, "__qualname__", repr(fn))] = len(calls)
     return calls
 
 def add_call_listener(listener):
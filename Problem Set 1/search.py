@@ -1,6 +1,8 @@
+from typing import Dict, Generic, List, Tuple
 from problem import HeuristicFunction, Problem, S, A, Solution
 from collections import deque
 from helpers import utils
+import heapq
 
 #TODO: Import any modules you want to use
 
@@ -12,6 +14,48 @@ from helpers import utils
 # 1. A list of actions which represent the path from the initial state to the final state
 # 2. None if there is no solution
 
+# The frontier of UCS, A* and Best-First search: a priority queue backed by a binary heap (heapq)
+# so every push and pop is O(log n) instead of sorting the whole frontier on every expansion.
+# Ties are broken by an insertion counter, so states with the same priority are popped in the order they were pushed
+# (which is the order a stable sort of a list gives).
+# Each state has at most one live entry: pushing a state that is already in the frontier with a lower priority
+# makes its old entry stale, and stale entries are skipped when they reach the top of the heap (lazy deletion).
+# Pushing it with an equal or higher priority does nothing since that entry could never be popped first.
+class PriorityFrontier(Generic[S]):
+    heap: List[Tuple[float, int, S, list]]
+    entries: Dict[S, Tuple[float, int]] # The (priority, counter) of the live entry of each state in the frontier
+    counter: int
+
+    def __init__(self):
+        self.heap = []
+        self.entries = {}
+        self.counter = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, state: S) -> bool:
+        return state in self.entries
+
+    # Adds the state with its path to the frontier and returns whether it was added
+    def push(self, priority: float, state: S, path: list) -> bool:
+        entry = self.entries.get(state)
+        if entry is not None and entry[0] <= priority:
+            return False
+        self.entries[state] = (priority, self.counter)
+        heapq.heappush(self.heap, (priority, self.counter, state, path))
+        self.counter += 1
+        return True
+
+    # Removes and returns the (priority, state, path) with the lowest priority (raises an IndexError if the frontier is empty)
+    def pop(self) -> Tuple[float, S, list]:
+        while self.heap:
+            priority, counter, state, path = heapq.heappop(self.heap)
+            if self.entries.get(state) == (priority, counter):
+                del self.entries[state]
+                return priority, state, path
+        raise IndexError("pop from an empty frontier")
+
 def BreadthFirstSearch(problem: Problem[S, A], initial_state: S) -> Solution:
     #TODO: ADD YOUR CODE HERE
 
@@ -100,8 +144,8 @@ def DepthFirstSearch(problem: Problem[S, A], initial_state: S) -> Solution:
 def UniformCostSearch(problem: Problem[S, A], initial_state: S) -> Solution:
     #TODO: ADD YOUR CODE HERE
     # Initialize the frontier with the initial state and an empty path
-    frontier = []
-    frontier.append((0, initial_state, []))
+    frontier = PriorityFrontier()
+    frontier.push(0, initial_state, [])
 
     # Initialize the explored set to keep track of visited states
     explored = set()
@@ -109,8 +153,7 @@ def UniformCostSearch(problem: Problem[S, A], initial_state: S) -> Solution:
     # Loop until a solution is found or the frontier is empty
     while frontier:
         # Pop the state with the lowest cost from the frontier
-        frontier.sort(key=lambda x: x[0])
-        cost, state, path = frontier.pop(0)
+        cost, state, path = frontier.pop()
 
         # If the state has already been explored, skip it
         if state in explored:
@@ -134,7 +177,7 @@ def UniformCostSearch(problem: Problem[S, A], initial_state: S) -> Solution:
             # If the next state has not been explored
             if next_state not in explored:
                 # Add the next state and the updated path to the frontier
-                frontier.append((next_cost, next_state, path + [action]))
+                frontier.push(next_cost, next_state, path + [action])
 
     return None
 
@@ -142,8 +185,8 @@ def AStarSearch(problem: Problem[S, A], initial_state: S, heuristic: HeuristicFu
     #TODO: ADD YOUR CODE HERE
 
     # Initialize the frontier with the initial state and an empty path
-    frontier = []
-    frontier.append((heuristic(problem,initial_state), initial_state, []))
+    frontier = PriorityFrontier()
+    frontier.push(heuristic(problem,initial_state), initial_state, [])
 
     # Initialize the explored set to keep track of visited states
     explored = set()
@@ -154,8 +197,7 @@ def AStarSearch(problem: Problem[S, A], initial_state: S, heuristic: HeuristicFu
         if len(frontier) == 0:
             return None
         # Pop the state with the lowest cost from the frontier
-        frontier.sort(key=lambda x: x[0])
-        cost, state, path = frontier.pop(0)
+        cost, state, path = frontier.pop()
 
         # If the state has already been explored, skip it
         if state in explored:
@@ -180,13 +222,13 @@ def AStarSearch(problem: Problem[S, A], initial_state: S, heuristic: HeuristicFu
             # If the next state has not been explored
             if next_state not in explored:
                 # Add the next cost the next state and the updated path to the frontier
-                frontier.append((next_cost, next_state, path + [action]))
+                frontier.push(next_cost, next_state, path + [action])
 
 def BestFirstSearch(problem: Problem[S, A], initial_state: S, heuristic: HeuristicFunction) -> Solution:
     #TODO: ADD YOUR CODE HERE
     # Initialize the frontier with the initial state and an empty path
-    frontier = []
-    frontier.append((heuristic(problem,initial_state), initial_state, []))
+    frontier = PriorityFrontier()
+    frontier.push(heuristic(problem,initial_state), initial_state, [])
 
     # Initialize the explored set to keep track of visited states
     explored = set()
@@ -197,8 +239,7 @@ def BestFirstSearch(problem: Problem[S, A], initial_state: S, heuristic: Heurist
         if len(frontier) == 0:
             return None
         # Pop the state with the lowest cost from the frontier
-        frontier.sort(key=lambda x: x[0])
-        _, state, path = frontier.pop(0)
+        _, state, path = frontier.pop()
 
         # If the state has already been explored, skip it
         if state in explored:
@@ -223,4 +264,4 @@ def BestFirstSearch(problem: Problem[S, A], initial_state: S, heuristic: Heurist
             # If the next state has not been explored
             if next_state not in explored:
                 # Add the next cost the next state and the updated path to the frontier
-                frontier.append((next_cost, next_state, path + [action]))
\ No newline at end of file
+                frontier.push(next_cost, next_state, path + [action])
\ No newline at end of file
@@ -0,0 +1,71 @@
+from typing import Callable, List
+import argparse, glob
+
+from CSP import Problem
+from sudoku import SudokuProblem
+from cryptarithmetic import CryptArithmeticProblem
+from game import Game, HeuristicFunction
+from tree import TreeGame, tree_heuristic
+from dungeon import DungeonGame, dungeon_heuristic
+from helpers.bench import Workload, count_calls, run_suite, write_results
+from helpers.utils import fetch_recorded_calls
+
+'''
+    The benchmark suite of this problem set runs:
+    - The backtracking "solve" on every sudoku in "sudoku/" (including its subfolders) and every cryptarithmetic puzzle in "puzzles/".
+      The node count is the number of calls to "is_complete" (like the autograder).
+    - Minimax, alpha-beta, alpha-beta with move ordering and expectimax on every tree in "trees/" (without a depth limit)
+      and every level in "dungeons/" (with the depth limit of the autograder's dungeon tests).
+      The node count is the number of calls to "is_terminal" (like the autograder).
+'''
+
+GAME_SEARCHES = ["minimax", "alphabeta", "alphabeta_with_move_ordering", "expectimax"]
+DUNGEON_SEARCH_DEPTH = 3
+
+def csp_workload(name: str, load: Callable[[], Problem]) -> Workload:
+    def setup():
+        from CSP_solver import solve
+        problem = load()
+        explored = count_calls(problem, "is_complete")
+        def run() -> int:
+            solve(problem)
+            return explored()
+        return run
+    return Workload(name, setup)
+
+def game_workload(name: str, load: Callable[[], Game], algorithm: str, heuristic: HeuristicFunction, max_depth: int) -> Workload:
+    def setup():
+        import search
+        search_fn = getattr(search, algorithm)
+        game = load()
+        fetch_recorded_calls(TreeGame.is_terminal) # Clear the calls recorded by the tree game
+        explored = count_calls(game, "is_terminal")
+        def run() -> int:
+            search_fn(game, game.get_initial_state(), heuristic, max_depth)
+            fetch_recorded_calls(TreeGame.is_terminal)
+            return explored()
+        return run
+    return Workload(name, setup)
+
+def get_workloads() -> List[Workload]:
+    workloads = []
+    for folder, from_file in [("sudoku", SudokuProblem.from_file), ("puzzles", CryptArithmeticProblem.from_file)]:
+        for path in sorted(glob.glob(f"{folder}/**/*.txt", recursive=True)):
+            workloads.append(csp_workload(f"solve/{path}", lambda path=path, from_file=from_file: from_file(path)))
+    games = [("trees/*.json", TreeGame.from_file, tree_heuristic, -1), ("dungeons/*.txt", DungeonGame.from_file, dungeon_heuristic, DUNGEON_SEARCH_DEPTH)]
+    for pattern, from_file, heuristic, max_depth in games:
+        for path in sorted(glob.glob(pattern)):
+            for algorithm in GAME_SEARCHES:
+                load = lambda path=path, from_file=from_file: from_file(path)
+                workloads.append(game_workload(f"{algorithm}/{path}", load, algorithm, heuristic, max_depth))
+    return workloads
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Runs the benchmark suite of the problem set")
+    parser.add_argument("--repeats", "-r", type=int, default=3, help="The number of timed runs of each workload")
+    parser.add_argument("--filter", "-f", default="*", help="A glob pattern to select the workloads by name (e.g. 'alphabeta/*')")
+    parser.add_argument("--output", "-o", default=None, help="Saves the results in a JSON file")
+    args = parser.parse_args()
+    results = run_suite(get_workloads(), args.repeats, args.filter)
+    if args.output:
+        write_results(args.output, results)
@@ -0,0 +1,91 @@
+from typing import Any, Callable, Dict, List
+from dataclasses import dataclass
+import fnmatch, gc, json, platform, statistics, time, tracemalloc
+
+'''
+    The benchmark suite of a problem set is a list of fixed workloads (e.g. a search algorithm on a level file).
+    Each workload is measured by:
+    - median_time and min_time (in seconds): the wall time of "repeats" runs where each run gets fresh inputs.
+    - peak_memory (in KB): the peak memory allocated during one extra run according to tracemalloc
+      (it runs separately since tracing slows down the code).
+    - nodes: the number of nodes that the workload explored (or the number of updates for the learning agents),
+      which must be the same in every run since the workloads are deterministic.
+    The root "bench.py" runs the suites of all the problem sets, stores the results in a history and compares them with a baseline.
+    Time measurements are only comparable on the same machine, so the baselines and the calibrations of the time limits
+    ("speed_test.py") are stored by "machine_key".
+'''
+
+# "setup" creates fresh inputs and returns the function to measure which returns the explored node count
+@dataclass
+class Workload:
+    name:   str
+    setup:  Callable[[], Callable[[], int]]
+
+# Replaces the method of the object with a wrapper that counts its calls and returns a function that reads the count
+def count_calls(obj: Any, name: str) -> Callable[[], int]:
+    method = getattr(obj, name)
+    calls = [0]
+    def counted(*args, **kwargs):
+        calls[0] += 1
+        return method(*args, **kwargs)
+    setattr(obj, name, counted)
+    return lambda: calls[0]
+
+def measure(workload: Workload, repeats: int = 3) -> Dict[str, Any]:
+    times: List[float] = []
+    node_counts = set()
+    for _ in range(repeats):
+        run = workload.setup()
+        gc.collect()
+        start = time.perf_counter()
+        nodes = run()
+        times.append(time.perf_counter() - start)
+        node_counts.add(nodes)
+    run = workload.setup()
+    gc.collect()
+    tracemalloc.start()
+    node_counts.add(run())
+    peak_memory = tracemalloc.get_traced_memory()[1] // 1024
+    tracemalloc.stop()
+    if len(node_counts) > 1:
+        raise RuntimeError(f"The workload {workload.name} is not deterministic: it explored {sorted(node_counts)} nodes")
+    return {
+        "name": workload.name,
+        "median_time": statistics.median(times),
+        "min_time": min(times),
+        "peak_memory": peak_memory,
+        "nodes": node_counts.pop(),
+        "repeats": repeats,
+    }
+
+def run_suite(workloads: List[Workload], repeats: int = 3, pattern: str = "*", verbose: bool = True) -> List[Dict[str, Any]]:
+    workloads = [workload for workload in workloads if fnmatch.fnmatchcase(workload.name, pattern)]
+    width = max((len(workload.name) for workload in workloads), default=0) + 2
+    results = []
+    if verbose: print(f"{'workload':<{width}}{'median (s)':>12}{'min (s)':>12}{'memory (KB)':>14}{'nodes':>10}", flush=True)
+    for workload in workloads:
+        result = measure(workload, repeats)
+        results.append(result)
+        if verbose:
+            print(f"{workload.name:<{width}}{result['median_time']:>12.4f}{result['min_time']:>12.4f}{result['peak_memory']:>14}{result['nodes']:>10}", flush=True)
+    return results
+
+def write_results(path: str, results: List[Dict[str, Any]]):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+def machine_key() -> str:
+    '''
+        Returns "CPU model | python implementation and version", which identifies the machine of a measurement.
+    '''
+    cpu = ""
+    try:
+        with open("/proc/cpuinfo", 'r') as f:
+            for line in f:
+                if line.startswith("model name"):
+                    cpu = line.split(":", 1)[1].strip()
+                    break
+    except OSError:
+        pass
+    cpu = cpu or platform.processor() or platform.machine() or "unknown"
+    return f"{cpu} | {platform.python_implementation()} {platform.python_version()}"
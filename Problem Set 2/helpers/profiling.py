@@ -0,0 +1,74 @@
+from typing import Any, Dict, List, Tuple
+import cProfile, os, pstats
+
+'''
+    The profiler of the autograder runs cProfile around the function and the comparator of each test case
+    (in the thread or the process that runs the test), then summarizes the profile so it can be sent back to the autograder:
+    - hotspots: the N functions with the highest cumulative time as (function, calls, own time, cumulative time).
+    - stacks (optional): the time (in microseconds) spent in each call stack in the "collapsed" format that
+      flamegraph tools read (one "caller;callee;... time" line per stack).
+    cProfile only records the callers of each function, so the stacks are estimated by splitting the time of each function
+    between its callers in proportion to the time spent in the calls from each caller.
+'''
+
+# A function in the profile is (file name, line number, function name)
+Function = Tuple[str, int, str]
+Hotspot = Tuple[str, int, float, float]
+
+# The stacks that are deeper than this or that take less than a microsecond are not expanded
+MAXIMUM_STACK_DEPTH = 64
+
+def function_label(function: Function) -> str:
+    file_name, line, name = function
+    if file_name == "~": return name # A built-in function
+    return f"{name} ({os.path.basename(file_name)}:{line})"
+
+def is_profiler_call(function: Function) -> bool:
+    return "_lsprof.Profiler" in function[2]
+
+def get_hotspots(stats: Dict[Function, Any], top: int) -> List[Hotspot]:
+    functions = sorted((item for item in stats.items() if not is_profiler_call(item[0])), key=lambda item: item[1][3], reverse=True)
+    return [(function_label(function), calls, own_time, cumulative_time)
+            for function, (_, calls, own_time, cumulative_time, _) in functions[:top]]
+
+def collapsed_stacks(stats: Dict[Function, Any]) -> Dict[str, int]:
+    callees: Dict[Function, List[Tuple[Function, float]]] = {}
+    for function, (*_, callers) in stats.items():
+        for caller, (*_, time) in callers.items():
+            callees.setdefault(caller, []).append((function, time))
+    stacks: Dict[str, int] = {}
+    def visit(function: Function, stack: List[str], share: float):
+        _, _, own_time, cumulative_time, _ = stats[function]
+        stack = stack + [function_label(function).replace(";", ",")]
+        key = ";".join(stack)
+        stacks[key] = stacks.get(key, 0) + round(own_time * share * 1e6)
+        if len(stack) >= MAXIMUM_STACK_DEPTH: return
+        for callee, time in callees.get(function, []):
+            callee_time = stats[callee][3]
+            if callee_time <= 0 or function_label(callee).replace(";", ",") in stack: continue # Skip the recursive calls
+            callee_share = share * min(1, time / callee_time)
+            if callee_share * callee_time >= 1e-6:
+                visit(callee, stack, callee_share)
+    for function, (*_, callers) in stats.items():
+        if not callers and not is_profiler_call(function):
+            visit(function, [], 1)
+    return {stack: time for stack, time in stacks.items() if time > 0}
+
+def summarize_profile(profiler: cProfile.Profile, top: int, stacks: bool = False) -> Dict[str, Any]:
+    stats = pstats.Stats(profiler).stats
+    summary: Dict[str, Any] = {"hotspots": get_hotspots(stats, top)}
+    if stacks: summary["stacks"] = collapsed_stacks(stats)
+    return summary
+
+def print_hotspots(hotspots: List[Hotspot]):
+    print(f"Profile (top {len(hotspots)} by cumulative time):")
+    print(f"{'calls':>10} {'own (s)':>10} {'cumulative (s)':>15}  function")
+    for label, calls, own_time, cumulative_time in hotspots:
+        print(f"{calls:>10} {own_time:>10.4f} {cumulative_time:>15.4f}  {label}")
+
+def write_collapsed_stacks(path: str, stacks: Dict[str, int]):
+    directory = os.path.dirname(path)
+    if directory: os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        for stack, time in sorted(stacks.items()):
+            f.write(f"{stack} {time}\n")
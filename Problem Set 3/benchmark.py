@@ -0,0 +1,60 @@
+from typing import List
+import argparse, glob
+
+from grid import GridEnv
+from training_loops import q_agent_training_loop
+from helpers.rl_utils import ACTIONS
+from helpers.bench import Workload, count_calls, run_suite, write_results
+
+'''
+    The benchmark suite of this problem set runs on every grid in "grids/":
+    - Value iteration for a fixed number of iterations (without a tolerance so every run does the same work).
+      The node count is the number of calls to "compute_bellman".
+    - Q-learning for a fixed number of updates with a seeded exploration.
+      The node count is the number of calls to "update".
+'''
+
+DISCOUNT_FACTOR = 0.99
+VALUE_ITERATIONS = 100
+Q_LEARNING_ITERATIONS = 5000
+Q_LEARNING_STEP_LIMIT = 50
+Q_LEARNING_EPSILON = 0.25
+Q_LEARNING_RATE = 0.1
+SEED = 1234
+
+def value_iteration_workload(path: str) -> Workload:
+    def setup():
+        from value_iteration import ValueIterationAgent
+        agent = ValueIterationAgent(GridEnv.from_file(path).mdp, DISCOUNT_FACTOR)
+        updates = count_calls(agent, "compute_bellman")
+        def run() -> int:
+            agent.train(VALUE_ITERATIONS)
+            return updates()
+        return run
+    return Workload(f"value_iteration/{path}", setup)
+
+def q_learning_workload(path: str) -> Workload:
+    def setup():
+        from reinforcement_learning import QLearningAgent
+        env = GridEnv.from_file(path)
+        agent = QLearningAgent(ACTIONS, DISCOUNT_FACTOR, Q_LEARNING_EPSILON, Q_LEARNING_RATE, SEED)
+        updates = count_calls(agent, "update")
+        def run() -> int:
+            q_agent_training_loop(env, agent, Q_LEARNING_ITERATIONS, Q_LEARNING_STEP_LIMIT, SEED)
+            return updates()
+        return run
+    return Workload(f"q_learning/{path}", setup)
+
+def get_workloads() -> List[Workload]:
+    paths = sorted(glob.glob("grids/*.json"))
+    return [value_iteration_workload(path) for path in paths] + [q_learning_workload(path) for path in paths]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Runs the benchmark suite of the problem set")
+    parser.add_argument("--repeats", "-r", type=int, default=3, help="The number of timed runs of each workload")
+    parser.add_argument("--filter", "-f", default="*", help="A glob pattern to select the workloads by name (e.g. 'q_learning/*')")
+    parser.add_argument("--output", "-o", default=None, help="Saves the results in a JSON file")
+    args = parser.parse_args()
+    results = run_suite(get_workloads(), args.repeats, args.filter)
+    if args.output:
+        write_results(args.output, results)
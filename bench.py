@@ -0,0 +1,139 @@
+from typing import Any, Dict, List
+import argparse, datetime, json, os, subprocess, sys, tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "shared"))
+from helpers.bench import machine_key
+
+'''
+    Runs the benchmark suites ("benchmark.py") of the problem sets, appends the results to a JSON history
+    and compares them with a stored baseline:
+    - A workload is slower if its median time grew by more than the time threshold (and by more than the minimum time difference).
+    - A workload uses more memory if its peak memory grew by more than the memory threshold (and by more than MINIMUM_MEMORY).
+    - A workload changed its behavior if it explored a different number of nodes.
+    Any of these is a regression, and the exit code is 1 if there is at least one.
+    The baseline is only comparable on the same machine, so a warning is printed if it was measured on another one.
+'''
+
+PROBLEM_SETS = {"1": "Problem Set 1", "2": "Problem Set 2", "3": "Problem Set 3"}
+ROOT = os.path.dirname(os.path.abspath(__file__))
+HISTORY_PATH = os.path.join(ROOT, "bench_history.json")
+BASELINE_PATH = os.path.join(ROOT, "bench_baseline.json")
+
+# Memory increases below this (in KB) are never regressions (the small workloads allocate a few KB)
+MINIMUM_MEMORY = 64
+
+# A run is {"timestamp", "machine", "commit", "repeats", "results": {workload name: measurements}}
+Run = Dict[str, Any]
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def run_problem_set(key: str, repeats: int, pattern: str) -> Dict[str, Dict[str, Any]]:
+    '''
+        Runs the suite of the problem set in its own folder (in a new process since every problem set has its own modules)
+        and returns its results by "PS<key>/<workload name>".
+    '''
+    folder = os.path.join(ROOT, PROBLEM_SETS[key])
+    print(f"\n{PROBLEM_SETS[key]}\n", flush=True)
+    handle, path = tempfile.mkstemp(suffix=".json")
+    os.close(handle)
+    try:
+        subprocess.run([sys.executable, "benchmark.py", "--repeats", str(repeats), "--filter", pattern, "--output", path],
+                       cwd=folder, check=True)
+        with open(path, 'r') as f:
+            results = json.load(f)
+    finally:
+        os.remove(path)
+    return {f"PS{key}/{result.pop('name')}": result for result in results}
+
+def load_json(path: str, default: Any) -> Any:
+    if not os.path.exists(path): return default
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def save_json(path: str, data: Any):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+def compare(run: Run, baseline: Run, time_threshold: float, memory_threshold: float, minimum_time: float) -> List[str]:
+    '''
+        Prints the comparison of every workload that is also in the baseline and returns the regressions.
+    '''
+    if baseline.get("machine") != run["machine"]:
+        print(f"\nWarning: the baseline was measured on another machine ({baseline.get('machine')}), the times may not be comparable")
+    regressions = []
+    print(f"\nComparison with the baseline of {baseline.get('timestamp', 'an unknown date')} {baseline.get('commit', '')}".rstrip())
+    rows = [(name, result, baseline["results"][name]) for name, result in run["results"].items() if name in baseline["results"]]
+    width = max((len(name) for name, _, _ in rows), default=0) + 2
+    print(f"{'workload':<{width}}{'time':>10}{'memory':>10}{'nodes':>16}  status")
+    for name, result, base in rows:
+        issues = []
+        time_ratio = result["median_time"] / base["median_time"] if base["median_time"] > 0 else 1
+        if time_ratio > 1 + time_threshold and result["median_time"] - base["median_time"] > minimum_time:
+            issues.append("slower")
+        memory_ratio = result["peak_memory"] / base["peak_memory"] if base["peak_memory"] > 0 else 1
+        if memory_ratio > 1 + memory_threshold and result["peak_memory"] - base["peak_memory"] > MINIMUM_MEMORY:
+            issues.append("more memory")
+        if result["nodes"] != base["nodes"]:
+            issues.append("nodes changed")
+        nodes = f"{base['nodes']}->{result['nodes']}" if result["nodes"] != base["nodes"] else str(result["nodes"])
+        print(f"{name:<{width}}{time_ratio:>9.2f}x{memory_ratio:>9.2f}x{nodes:>16}  {', '.join(issues) or 'ok'}")
+        regressions += [f"{name}: {issue}" for issue in issues]
+    new = len(run["results"]) - len(rows)
+    if new: print(f"{new} workloads are not in the baseline")
+    return regressions
+
+def main(args: argparse.Namespace) -> int:
+    sets = [key.strip() for key in args.sets.split(",")]
+    for key in sets:
+        if key not in PROBLEM_SETS:
+            print(f"Unknown problem set {key}, expected one of {', '.join(PROBLEM_SETS)}")
+            return 2
+    run: Run = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "machine": machine_key(),
+        "commit": git_commit(),
+        "repeats": args.repeats,
+        "results": {},
+    }
+    for key in sets:
+        run["results"].update(run_problem_set(key, args.repeats, args.filter))
+    history: List[Run] = load_json(args.history, [])
+    history.append(run)
+    save_json(args.history, history)
+    print(f"\nThe results are appended to {args.history} ({len(history)} runs)")
+    baseline = load_json(args.baseline, None)
+    if args.save_baseline:
+        # Only the workloads that ran are replaced, so a baseline can be updated one problem set (or filter) at a time
+        if baseline is not None and baseline.get("machine") == run["machine"]:
+            run = {**run, "results": {**baseline["results"], **run["results"]}}
+        save_json(args.baseline, run)
+        print(f"The baseline is saved to {args.baseline}")
+        return 0
+    if baseline is None:
+        print(f"There is no baseline to compare with, use --save-baseline to store one in {args.baseline}")
+        return 0
+    regressions = compare(run, baseline, args.time_threshold, args.memory_threshold, args.minimum_time)
+    if regressions:
+        print(f"\n{len(regressions)} regressions:")
+        for regression in regressions: print(f"- {regression}")
+        return 1
+    print("\nNo regressions")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Runs the benchmark suites of the problem sets and flags the regressions against a baseline")
+    parser.add_argument("--sets", "-s", default=",".join(PROBLEM_SETS), help="The problem sets to benchmark, separated by commas (default: all of them)")
+    parser.add_argument("--repeats", "-r", type=int, default=3, help="The number of timed runs of each workload")
+    parser.add_argument("--filter", "-f", default="*", help="A glob pattern to select the workloads by name (e.g. 'astar/*')")
+    parser.add_argument("--history", default=HISTORY_PATH, help="The JSON file where the results of every run are appended")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="The JSON file of the baseline results")
+    parser.add_argument("--save-baseline", action="store_true", help="Stores the results as the baseline instead of comparing them with it")
+    parser.add_argument("--time-threshold", type=float, default=0.2, help="The relative increase of the median time that is a regression")
+    parser.add_argument("--memory-threshold", type=float, default=0.2, help="The relative increase of the peak memory that is a regression")
+    parser.add_argument("--minimum-time", type=float, default=0.002, help="Time increases below this (in seconds) are never regressions")
+    args = parser.parse_args()
+    exit(main(args))
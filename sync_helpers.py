@@ -0,0 +1,65 @@
+from typing import Dict, List, Tuple
+import argparse, os
+
+'''
+    Every problem set is a self-contained folder (it is handed out and graded on its own, with its own "helpers" package),
+    so the autograder helpers that are the same in every problem set are deliberately copied into each of them.
+    The single source of these helpers is "shared/helpers": edit them there, then run this script to copy them
+    into the problem sets, byte for byte except for the line endings (each copy uses the line endings of its problem set,
+    e.g. CRLF in problem set 0). With "--check", nothing is written and the copies that differ from the source are listed
+    (the exit code is 1 if any).
+    The autograders themselves are not shared since they differ between the problem sets.
+'''
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SHARED_DIRECTORY = os.path.join(ROOT, "shared", "helpers")
+
+# The problem sets that use each shared helper
+SHARED_HELPERS: Dict[str, List[str]] = {
+    "bench.py": ["Problem Set 0", "Problem Set 1", "Problem Set 2", "Problem Set 3"],
+    "fixtures.py": ["Problem Set 0", "Problem Set 1", "Problem Set 2", "Problem Set 3"],
+    "profiling.py": ["Problem Set 0", "Problem Set 1", "Problem Set 2", "Problem Set 3"],
+    "report.py": ["Problem Set 0", "Problem Set 1", "Problem Set 2", "Problem Set 3"],
+    "results.py": ["Problem Set 0", "Problem Set 1", "Problem Set 2", "Problem Set 3"],
+}
+
+def read_bytes(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+# Returns the line ending used by the problem set (read from its "helpers/globals.py" which is not shared)
+def line_ending(problem_set: str) -> bytes:
+    return b"\r\n" if b"\r\n" in read_bytes(os.path.join(ROOT, problem_set, "helpers", "globals.py")) else b"\n"
+
+# Returns the content that the copy of the shared helper should have in the problem set
+def expected_copy(name: str, problem_set: str) -> bytes:
+    source = read_bytes(os.path.join(SHARED_DIRECTORY, name)).replace(b"\r\n", b"\n")
+    return source.replace(b"\n", line_ending(problem_set))
+
+# Returns the (path relative to the root, expected content) of the copies that differ from their source
+def outdated_copies() -> List[Tuple[str, bytes]]:
+    outdated = []
+    for name, problem_sets in SHARED_HELPERS.items():
+        for problem_set in problem_sets:
+            path = os.path.join(ROOT, problem_set, "helpers", name)
+            expected = expected_copy(name, problem_set)
+            if not os.path.exists(path) or read_bytes(path) != expected:
+                outdated.append((os.path.relpath(path, ROOT), expected))
+    return outdated
+
+def main(args: argparse.Namespace) -> int:
+    outdated = outdated_copies()
+    if args.check:
+        for path, _ in outdated: print(f"Outdated: {path}")
+        return 1 if outdated else 0
+    for path, expected in outdated:
+        with open(os.path.join(ROOT, path), 'wb') as f:
+            f.write(expected)
+        print(f"Updated: {path}")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Copies the shared autograder helpers into every problem set")
+    parser.add_argument("--check", action="store_true", help="Only lists the copies that differ from the shared helpers")
+    args = parser.parse_args()
+    exit(main(args))